@@ -0,0 +1,287 @@
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import importlib.util
+import threading
+import statistics
+import argparse # command-line arguments
+import http.server
+import urllib.parse
+
+from typing import Any, Callable # typing for functions
+
+
+# command-line argument setup
+parser: argparse.ArgumentParser = argparse.ArgumentParser(description="benchmark the scrape, parse and write phases of `main.py` against a local stand-in for the Meteoritical Bulletin")
+parser.add_argument("--rows", "-l", help="number of meteorites per page", type=int, default=1000)
+parser.add_argument("--pages", "-n", help="number of result pages", type=int, default=8)
+parser.add_argument("--latency", help="seconds the stand-in server waits before answering every request", type=float, default=0.05)
+parser.add_argument("--error-rate", help="fraction of requests the stand-in server answers with 503", type=float, default=0.0, dest="error_rate")
+parser.add_argument("--thread-counts", "-c", help="comma separated thread counts to download with", type=str, default="1,4,8,16", dest="thread_counts")
+parser.add_argument("--engines", "-e", help="comma separated download engines to benchmark", type=str, default="threads,async")
+parser.add_argument("--parsers", help="comma separated parser backends to benchmark", type=str, default="html.parser,fast")
+parser.add_argument("--repeat", "-r", help="how many times to repeat every measurement", type=int, default=3)
+parser.add_argument("--seed", help="seed for the generated meteorites", type=int, default=0)
+parser.add_argument("--output", "-o", help="file to write the JSON results to (printed if not given)", type=str, default="")
+args: argparse.Namespace = parser.parse_args()
+
+
+#===================GENERATED DATA======================#
+# columns as they appear in the results table of the website
+columns: list[str] = ["Name", "Abbrev", "Status", "Year", "Type", "Mass", "Place", "(Lat,Long)", "Fall", "Antarctic", "MetBull", "Notes"]
+
+# values to pick from, roughly following how often they show up on the website
+statuses: list[str] = ["Official"]*8 + ["Provisional", "Crater", "Relict", "Doubtful", "Discredited"]
+years: list[str] = [str(y) for y in range(1950, 2024)] + ["(unknown)", "1967 or 1927", "35 Ma", "0.5 ka", ""]
+types: list[str] = ["L6", "H5", "H6", "LL6", "L5", "H4", "CM2", "Eucrite-pmict", "Iron, IIIAB", "Ureilite", "Impact crater"]
+places: list[str] = ["Northwest Africa", "Antarctica", "Oman", "Libya", "Algeria", "Chile", "Morocco", "Australia", "USA", "China"]
+mass_units: list[str] = ["g", "g", "g", "kg", "mg", "t"]
+
+# everything else on the real page we do not care about, so parsers skipping it get rewarded like they would on the website
+page_filler: str = "".join(f"<div class='menu'><a href='metbull.php?browse={i}'>Link {i}</a>&nbsp;<span>filler</span></div>" for i in range(500))
+#=======================================================#
+
+
+def generate_row(index: int) -> list[str]:
+    rng: random.Random = random.Random(args.seed*1_000_003 + index)
+
+    # the website separates numbers and units with non-breaking spaces
+    mass: str = "" if rng.random() < 0.1 else f"{round(rng.lognormvariate(3, 2), rng.choice([0, 1, 2]))}\xa0{rng.choice(mass_units)}"
+    lat_long: str = "" if rng.random() < 0.4 else f"({rng.uniform(-90, 90):.5f},\xa0{rng.uniform(-180, 180):.5f})"
+
+    return [
+        f"{rng.choice(places)} {index:05d}",
+        "",
+        rng.choice(statuses),
+        rng.choice(years),
+        rng.choice(types),
+        mass,
+        rng.choice(places),
+        lat_long,
+        rng.choice(["", "", "", "Y"]),
+        rng.choice(["", "Y"]),
+        str(rng.randint(1, 112)),
+        rng.choice(["", "*", "Approved 2 Dec 2020 #", "\xa0"])
+    ]
+
+
+def generate_page(page: int, rows: int, total: int) -> bytes:
+    start: int = (page - 1)*rows
+    html: list[str] = [f"<html><head><meta charset='utf-8'></head><body>{page_filler}<p>{total} records found</p>"]
+
+    html.append("<table id='maintable'><tr>")
+    html.extend(f"<th class='insidehead'>{column}</th>" for column in columns)
+    html.append("</tr>")
+
+    i: int
+    for i in range(start, min(start + rows, total)):
+        html.append("<tr>" + "".join(f"<td>{value}</td>" for value in generate_row(i)) + "</tr>")
+
+    html.append(f"</table>{page_filler}</body></html>")
+    return "".join(html).encode("utf-8")
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    # answers `metbull.php` searches like the website would, with `args.rows*args.pages` meteorites in total
+
+    def log_message(self, format: str, *log_args: Any) -> None:
+        pass
+
+
+    def do_GET(self) -> None:
+        time.sleep(args.latency)
+
+        if random.random() < args.error_rate:
+            self.send_error(503)
+            return
+
+        query: dict[str, str] = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(self.path).query, keep_blank_values=True))
+        rows: int = int(query.get("lrec", "50"))
+        page: int = int(query.get("page", "1"))
+
+        body: bytes = generate_page(page, rows, args.rows*args.pages)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server() -> http.server.ThreadingHTTPServer:
+    server: http.server.ThreadingHTTPServer = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+#======================MEASURING========================#
+results: list[dict[str, Any]] = []
+
+
+# run `function` `args.repeat` times and record how long it took, `items` is whatever the phase processes (pages, rows, cells)
+# `setup` runs before every repetition without being timed, e.g. to empty caches so every repetition starts cold
+def measure(
+    phase: str,
+    function: Callable[[], Any],
+    items: int=0,
+    setup: Callable[[], Any] | None=None,
+    **params: Any
+) -> Any: # break arguments into seperate lines to avoid line being to long
+    timings: list[float] = []
+    output: Any = None
+
+    i: int
+    for i in range(max(args.repeat, 1)):
+        if setup is not None:
+            setup()
+        start_time: float = time.perf_counter()
+        output = function()
+        timings.append(time.perf_counter() - start_time)
+
+    best: float = min(timings)
+    results.append({
+        "phase": phase,
+        "params": params,
+        "items": items,
+        "best": best,
+        "mean": statistics.mean(timings),
+        "timings": timings,
+        "items_per_second": items/best if items and best > 0 else None
+    })
+    print(f"{phase} {params}: best {round(best, 5)}s", file=sys.stderr)
+
+    return output
+#=======================================================#
+
+
+def main() -> None:
+    server: http.server.ThreadingHTTPServer = start_server()
+
+    # `main.py` reads its options and creates its directories on import, so set both up before importing it
+    repo_dir: str = os.path.dirname(os.path.abspath(__file__))
+    output_path: str = os.path.abspath(args.output) if args.output else ""
+    sys.path.insert(0, repo_dir)
+    os.chdir(tempfile.mkdtemp(prefix="metbull-benchmark-"))
+    sys.argv = ["main.py", "--listings", str(args.rows), "--no-count-cache"]
+
+    import main as pipeline
+    from utils.webscraping import MultiScraper, PageScraper, RetryPolicy
+    from utils.datafiles import HTMLFile, JSONFile, CSVFile
+    from utils.datatable import ColumnTable
+
+    # the column memos outlive a measurement, so memoised phases are measured cold unless stated otherwise
+    def clear_memos() -> None:
+        for memo in pipeline.column_memos.values():
+            memo.cache_clear()
+
+    pipeline.homepage_url = f"http://127.0.0.1:{server.server_address[1]}/metbull.php?"
+    url: str = pipeline.get_url(sea=pipeline.sea, sfor=pipeline.sfor, valids=pipeline.valids, stype=pipeline.stype, lrec=pipeline.lrec, map=pipeline.map)
+
+    # page count discovery
+    page_count: int = measure("get_page_count", lambda: pipeline.get_page_count()[0], items=1)
+    if page_count == -1:
+        print("Could not find number of pages (try a lower --error-rate). Aborting!", file=sys.stderr)
+        return
+    pages: dict[str, str] = {f"page{i}": url + f"&page={i}" for i in range(1, page_count + 1)}
+
+    # downloading with every engine and thread count
+    retry_policy: RetryPolicy = RetryPolicy(attempts=5, backoff=0.01)
+    scraper: MultiScraper = MultiScraper(pages, headers=pipeline.headers, retry_policy=retry_policy)
+
+    engine: str
+    for engine in args.engines.split(","):
+        if engine == "async":
+            if importlib.util.find_spec("aiohttp") is None:
+                print("Skipping the async engine, since aiohttp is not installed.", file=sys.stderr)
+                continue
+
+        threads: int
+        for threads in [int(count) for count in args.thread_counts.split(",")]:
+            measure(
+                "init_scrapers",
+                lambda: scraper.init_scrapers(pipeline.html_data_dir, threads, force=True, engine=engine, revalidate=False),
+                items=page_count,
+                engine=engine,
+                threads=threads
+            )
+    scraper.close()
+
+    if scraper.failures:
+        print(f"{len(scraper.failures)} pages failed to download, parsing the rest.", file=sys.stderr)
+    html_files: list[HTMLFile] = [scraper.get_scraper(name).html_file for name in pages.keys() if not scraper.is_failed(name)] # type: ignore # always set after downloading
+    if not html_files:
+        print("No pages were downloaded, nothing to parse. Aborting!", file=sys.stderr)
+        return
+    row_count: int = args.rows*len(html_files)
+
+    # parsing every page with every backend
+    backend: str
+    for backend in args.parsers.split(","):
+        measure(
+            "parse_page",
+            lambda: [pipeline.parse_html_file(html_file, backend) for html_file in html_files],
+            items=row_count,
+            setup=clear_memos,
+            backend=backend
+        )
+
+    # transforms over the raw cells of the first page
+    page_scraper: PageScraper = PageScraper("", html_file=html_files[0])
+    pipeline.start_page_parser(page_scraper, "fast")
+    table_rows = page_scraper.parser.find("table", { "id": "maintable" }).find_all("tr") # type: ignore
+    page_scraper.stop_parser()
+
+    cells: list[tuple[str, str]] = [(td.text, columns[j]) for row in table_rows[1:] for j, td in enumerate(row.find_all("td"))]
+    measure("transform_data", lambda: [pipeline.transform_data(data, variable) for data, variable in cells], items=len(cells))
+
+    # the same cells through the column memos the parsers use
+    memo_cells: list[tuple[str, Callable[[str], Any]]] = [(data, pipeline.get_column_memo(variable)) for data, variable in cells]
+    measure("transform_memo", lambda: [transform(data) for data, transform in memo_cells], items=len(cells), setup=clear_memos, memos="cold")
+    measure("transform_memo", lambda: [transform(data) for data, transform in memo_cells], items=len(cells), memos="warm")
+
+    column_transforms: dict[str, Callable[[str], Any]] = {
+        "Year": pipeline.transform_year,
+        "Mass": pipeline.transform_mass,
+        "(Lat,Long)": pipeline.transform_ll
+    }
+    column: str
+    for column, transform in column_transforms.items():
+        # the transforms expect the already cleaned up values `transform_data` hands them
+        values: list[str] = [data.replace("\xa0", " ").strip() for data, variable in cells if variable == column and data.strip()]
+        measure(f"{transform.__name__}", lambda: [transform(value) for value in values], items=len(values))
+
+    # writing the outputs of all the pages
+    meteorite_table: ColumnTable = ColumnTable()
+    html_file: HTMLFile
+    for html_file in html_files:
+        page_variables, page_rows, *_ = pipeline.parse_html_file(html_file, "fast")
+        meteorite_table.add_rows(page_variables, page_rows)
+
+    json_file: JSONFile = JSONFile(pipeline.data_dir, "output")
+    csv_file: CSVFile = CSVFile(pipeline.data_dir, "output", delimiter=";")
+    measure("write_json", lambda: json_file.write_json_array(meteorite_table.iter_records(), force=True), items=len(meteorite_table))
+    measure("write_dict", lambda: csv_file.write_dict(meteorite_table.variables, meteorite_table.iter_records(), force=True), items=len(meteorite_table))
+
+    server.shutdown()
+
+    report: dict[str, Any] = {
+        "settings": vars(args),
+        "python": sys.version,
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }
+
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
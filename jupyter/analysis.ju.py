@@ -27,21 +27,31 @@ import matplotlib as plt
 # %% [markdown]
 """
 #### Uvoz podatkov
-Uvozimo podatke dobljene iz programa v pandas tabelo:
+Uvozimo podatke dobljene iz programa v pandas tabelo.
+Če smo program nazadnje zagnali z `--parquet`, preberemo že urejene stolpce z ustreznimi tipi, brez razčlenjevanja (zagon brez `--parquet` `output.parquet` izbriše, zato nikoli ne beremo starih podatkov).
+Če smo ga nazadnje zagnali z `--format ndjson`, podatke beremo po kosih (vsak zagon izbriše izhodno datoteko druge oblike):
 """
 # %%
-df = pd.read_json("../data/output.json", precise_float=True)
+import os
+
+if os.path.exists("../data/output.parquet"):
+    df = pd.read_parquet("../data/output.parquet")
+elif os.path.exists("../data/output.ndjson"):
+    df = pd.concat(pd.read_json("../data/output.ndjson", lines=True, chunksize=10000, precise_float=True), ignore_index=True)
+else:
+    df = pd.read_json("../data/output.json", precise_float=True)
 df.index.names = ["id"]
 # %% [markdown]
 """
 Tabelo vseh podatkov uredimo po imenih po abecedi, kjer zanemarimo prednost velikih črk pred malimi.
-Hkrati pa hočemo stolpec "(Lat,Long)" razdeliti na dva nova stolpca "Latitude" in "Longitude" za lažjo uporabo.
+Hkrati pa hočemo stolpec "(Lat,Long)" razdeliti na dva nova stolpca "Latitude" in "Longitude" za lažjo uporabo (v `output.parquet` sta že razdeljena).
 Potem lahko originalnega izbrišemo in stolpce preuredimo kot hočemo.
 """
 # %%
 df = df.sort_values(by="Name", key=lambda c: c.str.lower())
-clean_ll_df = df["(Lat,Long)"].dropna()
-df[["Latitude", "Longitude"]] = pd.DataFrame(clean_ll_df.to_list(), index=clean_ll_df.index)
+if "(Lat,Long)" in df.columns:
+    clean_ll_df = df["(Lat,Long)"].dropna()
+    df[["Latitude", "Longitude"]] = pd.DataFrame(clean_ll_df.to_list(), index=clean_ll_df.index)
 col_order = ["Name", "Abbrev", "Status", "Year", "Type", "Mass", "Place",
              "Latitude", "Longitude", "Fall", "Antarctic", "MetBull", "Notes"]
 df = df[col_order]
@@ -1,20 +1,55 @@
 import re
 import unicodedata # dealing with unicode
+import html
 import time
+import itertools
+import functools
 import argparse # command-line arguments
+import concurrent.futures as cf
+import multiprocessing
+import cProfile
+import pstats
+import marshal
+import tracemalloc
+
+import requests as req
+import bs4 as bs
 
 # locally sourced modules
-from utils.webscraping import PageScraper, MultiScraper
-from utils.datafiles import Directory, File, CSVFile, JSONFile
+from utils.webscraping import PageScraper, MultiScraper, RetryPolicy, RateLimiter, ConcurrencyController
+from utils.datafiles import Directory, File, HTMLCache, HTMLFile, CSVFile, JSONFile, NDJSONFile, ParquetFile, SQLiteFile
+from utils.datatable import ColumnTable
+from utils.metrics import Metrics, peak_memory
 
-from typing import Callable # typing for functions
+from contextlib import AbstractContextManager, ExitStack
+from typing import Any, Callable, Iterable, Iterator # typing for functions and generators
 
 
 # command-line argument setup
 parser: argparse.ArgumentParser = argparse.ArgumentParser()
-parser.add_argument("--thread-count", "-c", help="number of threads used for saving the HTML files", type=int, default=8, dest="threads")
+parser.add_argument("--thread-count", "-c", help="number of threads used for saving the HTML files (concurrent requests with `--engine async`)", type=int, default=8, dest="threads")
+parser.add_argument("--adaptive", help="adapt the number of concurrent downloads to how the website copes, starting from `--thread-count`", action="store_true")
+parser.add_argument("--max-thread-count", help="highest number of concurrent downloads `--adaptive` can go up to", type=int, default=32, dest="max_threads")
+parser.add_argument("--engine", "-e", help="download engine to use, `async` requires aiohttp", choices=["threads", "async"], default="threads")
+parser.add_argument("--parse-workers", "-p", help="number of processes used for parsing the HTML files (1 parses in the main process)", type=int, default=1, dest="parse_workers")
+parser.add_argument("--parser", help="HTML parser backend, `fast` only builds the results table (using lxml if installed), `regex` pulls it straight out of the raw page", choices=["html.parser", "lxml", "html5lib", "fast", "regex"], default="fast", dest="parser_backend")
+parser.add_argument("--format", help="format of the JSON output, `ndjson` writes one meteorite per line to `data/output.ndjson`", choices=["json", "ndjson"], default="json", dest="output_format")
+parser.add_argument("--parquet", help="also write typed columns to `data/output.parquet`, requires pyarrow", action="store_true")
+parser.add_argument("--sqlite", help="also insert or update the meteorites (by name) in `data/output.sqlite`", action="store_true")
+parser.add_argument("--memo-size", help="number of transformed values remembered per column (0 to disable)", type=int, default=4096, dest="memo_size")
 parser.add_argument("--no-force", help="will not download HTML files again if they already exist", action="store_false", dest="force")
+parser.add_argument("--retries", "-r", help="number of times to retry downloading a page after a timeout or server error", type=int, default=3)
+parser.add_argument("--rate", help="maximum number of requests per second sent to the website (0 for no limit)", type=float, default=0.0)
+parser.add_argument("--no-revalidate", help="will download HTML files again even if the website reports they did not change", action="store_false", dest="revalidate")
+parser.add_argument("--no-parse-cache", help="will parse every page again instead of using what was parsed out of the same page before", action="store_false", dest="parse_cache")
+parser.add_argument("--no-count-cache", help="will always ask the website for the number of pages instead of using the one from the last run", action="store_false", dest="count_cache")
 parser.add_argument("--clear", help="will clear the entire `data/html/` directory before downloading", action="store_true")
+parser.add_argument("--html-compression", help="how to store the downloaded pages in `data/html/`, `zstd` requires zstandard", choices=["none", "gzip", "zstd"], default="gzip", dest="html_compression")
+parser.add_argument("--cache-size", help="maximum size of `data/html/` in MB, least recently downloaded pages of other searches are removed first (0 for no limit)", type=float, default=0.0, dest="cache_size")
+parser.add_argument("--cache-age", help="maximum age of the pages of other searches in `data/html/` in days (0 for no limit)", type=float, default=0.0, dest="cache_age")
+parser.add_argument("--metrics", help="write what every page took to download, parse and write to `data/metrics.ndjson` and print a summary at the end", action="store_true")
+parser.add_argument("--profile", help="profile the main process with cProfile and tracemalloc (a lot slower), writing the results to `data/profile.pstats` and `data/profile.txt`", action="store_true")
+parser.add_argument("--incremental", "-i", help="only download the pages past the end of the last run (meant for sort orders adding new meteorites at the end, like `--sort date`)", action="store_true")
 
 parser.add_argument("--search", "-s", help="the string to use for search the database", type=str, default="*", dest="sea")
 parser.add_argument("--search-for", "-f", help="what to search for with the search string", choices=["names", "text", "places", "classes", "years"], default="names", dest= "sfor")
@@ -22,6 +57,7 @@ parser.add_argument("--valids", "-v", help="restrict search to only valid meteor
 parser.add_argument("--search-type", "-t", help="what type of search to perform", choices=["contains", "starts", "exact", "sounds"], default="contains", dest="stype")
 parser.add_argument("--listings", "-l", help="number of listings per page", type=str, default="5000", dest="lrec")
 parser.add_argument("--map", "-m", help="type of location data to return", choices=["gg", "ge", "ww", "ll", "dm", "none"], default="ll")
+parser.add_argument("--sort", help="order of the results, the website's default if not given", choices=["name", "date"], default="", dest="srt")
 args: argparse.Namespace = parser.parse_args()
 
 
@@ -33,6 +69,7 @@ valids: str = args.valids # valids - disable search for only valid meteorites
 stype: str = args.stype # stype - type of search
 lrec: str = args.lrec # lrec - meteorites per page
 map: str = args.map # map - display decimal degrees location
+srt: str = args.srt # srt - sort order of the results
 
 # Example URL: https://www.lpi.usra.edu/meteor/metbull.php?sea=%2A&sfor=names&ants=&nwas=&falls=&valids=yes&stype=contains&lrec=50&map=ll&browse=&country=All&srt=name&categ=All&mblist=All&rect=&phot=&strewn=&snew=0&pnt=Normal%20table&dr=&page=1
 # website URL with preset search options
@@ -48,10 +85,53 @@ headers: dict[str, str] = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.97 Safari/537.36",
 }
 
+# every request to the website is retried and rate limited the same way, including the one for the page count
+retry_policy: RetryPolicy = RetryPolicy(attempts=args.retries + 1)
+rate_limiter: RateLimiter | None = RateLimiter(args.rate) if args.rate > 0 else None
+
 # directory where to save resulting csv/json files
 data_dir: Directory = Directory("data/")
-# directory where to save HTML files
-html_data_dir: Directory = Directory("data/html/")
+# directory where to save HTML files, named by the hash of their URL
+html_data_dir: HTMLCache = HTMLCache("data/html/", compression=args.html_compression)
+# meteorite counts of previous searches, so downloading can start without waiting for one
+count_cache_file: JSONFile = JSONFile(data_dir, "count_cache")
+# page count and names on the last page of previous searches, so `--incremental` knows where the last run ended
+incremental_state_file: JSONFile = JSONFile(data_dir, "incremental_state")
+
+# measurements of this run, only written out with `--metrics`
+metrics: Metrics = Metrics()
+metrics_file: NDJSONFile = NDJSONFile(data_dir, "metrics")
+profile_stats_file: File = File(data_dir, "profile.pstats")
+profile_report_file: File = File(data_dir, "profile.txt")
+
+# every search results page starts with the number of meteorites found
+records_pattern: re.Pattern[bytes] = re.compile(rb"(\d+) records found")
+# parts of the results table for the `regex` parser backend, closing tags are optional like they are in HTML
+table_pattern: re.Pattern[bytes] = re.compile(rb"<table\b[^>]*\bid\s*=\s*[\"']?maintable\b[^>]*>", flags=re.IGNORECASE)
+table_end_pattern: re.Pattern[bytes] = re.compile(rb"</table\s*>", flags=re.IGNORECASE)
+row_pattern: re.Pattern[bytes] = re.compile(rb"<tr\b[^>]*>(.*?)(?=<tr\b|\Z)", flags=re.IGNORECASE | re.DOTALL)
+head_cell_pattern: re.Pattern[bytes] = re.compile(rb"<th\b[^>]*\bclass\s*=\s*[\"']?[^\"'>]*\binsidehead\b[^>]*>(.*?)(?=</th|<th\b|\Z)", flags=re.IGNORECASE | re.DOTALL)
+cell_pattern: re.Pattern[bytes] = re.compile(rb"<td\b[^>]*>(.*?)(?=</td|<td\b|\Z)", flags=re.IGNORECASE | re.DOTALL)
+tag_pattern: re.Pattern[bytes] = re.compile(rb"<[^>]*>")
+# typed columns of the Parquet and SQLite outputs, "(Lat,Long)" is split into two columns (see `to_typed_metdict`)
+# years are floats, since craters have their age in years with decimals, and masses are in grams
+typed_schema: dict[str, str] = {
+    "Name": "string",
+    "Abbrev": "string",
+    "Status": "category",
+    "Year": "float64",
+    "Type": "category",
+    "Mass": "float64",
+    "Place": "string",
+    "Latitude": "float64",
+    "Longitude": "float64",
+    "Fall": "category",
+    "Antarctic": "string",
+    "MetBull": "int64",
+    "Notes": "string"
+}
+# columns of the SQLite output most queries filter or sort by
+sqlite_indexes: list[str] = ["Name", "Status", "Year", "Type", "Mass"]
 #=======================================================#
 
 
@@ -59,6 +139,8 @@ html_data_dir: Directory = Directory("data/html/")
 # custom types used later on to shorten typing annotations - REQUIRES PYTHON 3.12+!!!
 type MeteoriteValue = str | int | float | tuple[float, float]
 type MeteoriteDict = dict[str, MeteoriteValue]
+# variable names, rows, time taken, transform memo (hits, misses) per column and number of transformed cells of a parsed page
+type ParseResult = tuple[list[str], list[list[MeteoriteValue]], float, dict[str, tuple[int, int]], int]
 
 # typing for **kwargs ignored due to annoyance and complexity
 # make the url with valid options
@@ -70,7 +152,8 @@ def get_url(**kwargs) -> str:
         "valids": lambda s: s in ["yes", ""],
         "stype": lambda s: s in ["contains", "starts", "exact", "sounds"],
         "lrec": lambda s: type(s) is str and s.isnumeric(), # lrec can be any positive number represented as a string
-        "map": lambda s: s in ["gg", "ge", "ww", "ll", "dm", "none"]
+        "map": lambda s: s in ["gg", "ge", "ww", "ll", "dm", "none"],
+        "srt": lambda s: s in ["name", "date"]
     }
     url: str = homepage_url
 
@@ -86,89 +169,327 @@ def get_url(**kwargs) -> str:
     return url
 
 
-# TODO: find a faster way of getting page count
-# get page count from number of results on smaller page to save time
-# this improves execution speed from previous method of getting pagecount from first page (no need to load that much data)
-def get_page_count() -> int:
+def count_pages(meteor_count: int) -> int:
+    # kind of a hack to get rounding up
+    per_page: int = int(lrec)
+    return (meteor_count - 1)//per_page + 1
+
+
+# the meteorite count does not depend on `lrec` or `map`, so only the search options are part of the query
+def get_count_query() -> str:
+    return get_url(sea=sea, sfor=sfor, valids=valids, stype=stype, lrec="1")
+
+
+def read_cached_count() -> int | None:
+    if not count_cache_file.exists():
+        return None
+
+    try:
+        cache: dict[str, int] = count_cache_file.read_json()
+    except ValueError: # broken cache is the same as no cache
+        return None
+
+    return cache.get(get_count_query())
+
+
+def write_cached_count(meteor_count: int) -> None:
+    cache: dict[str, int] = {}
+    if count_cache_file.exists():
+        try:
+            cache = count_cache_file.read_json()
+        except ValueError:
+            pass
+
+    cache[get_count_query()] = meteor_count
+    count_cache_file.write_json(cache, force=True)
+
+
+# get meteorite count from number of results on smaller page to save time
+# the page is streamed and the connection dropped as soon as the count shows up, so only the first few KB get downloaded
+def get_meteor_count() -> int:
     # scrape with same options, but only 1 meteorite per page to save time
-    small_scraper: PageScraper = PageScraper(get_url(sea=sea, sfor=sfor, valids=valids, stype=stype, lrec="1", map=map), headers=headers)
-    pattern: str = r"(\d+) records found"
-    match: re.Match[str] | None = re.search(pattern, small_scraper.get_html())
+    small_scraper: PageScraper = PageScraper(
+        get_url(sea=sea, sfor=sfor, valids=valids, stype=stype, lrec="1", map=map),
+        headers=headers,
+        retry_policy=retry_policy,
+        rate_limiter=rate_limiter
+    )
+
+    match: re.Match[bytes] | None
+    try:
+        match = small_scraper.search_html(records_pattern)
+    except req.RequestException as error:
+        # still failing after all the retries
+        print(f"Could not get the number of meteorites from the website: {error!r}")
+        return -1
 
     if match is None:
         return -1
 
-    meteor_count: int = int(match.group(1))
+    return int(match.group(1))
 
-    # kind of a hack to get rounding up
-    per_page: int = int(lrec)
-    page_count: int = (meteor_count - 1)//per_page + 1
 
+# returns the page count and whether it came from the cache
+def get_page_count() -> tuple[int, bool]:
+    # with a cached count downloading can start right away, it gets checked against the first page afterwards
+    # `--incremental` needs to know exactly where the results end now, so it always asks
+    if args.count_cache and not args.incremental:
+        cached_count: int | None = read_cached_count()
+
+        if not cached_count is None:
+            page_count: int = count_pages(cached_count)
+            print(f"Found {page_count} pages (cached).")
+            return page_count, True
+
+    meteor_count: int = get_meteor_count()
+    if meteor_count == -1:
+        return -1, False
+
+    write_cached_count(meteor_count)
+
+    page_count = count_pages(meteor_count)
     print(f"Found {page_count} pages.")
-    return page_count
+    return page_count, False
+
+
+# the first page also shows the meteorite count, so we can check if the cached count went stale without another request
+# yields the names of any pages that were missing and had to be downloaded
+def verify_page_count(scraper: MultiScraper, url: str) -> Iterator[str]:
+    if not scraper.is_used("page1") or scraper.is_failed("page1"):
+        print("\n", "Could not check the cached number of pages, as the first page was not downloaded.", sep="")
+        return
 
+    html_file: HTMLFile = scraper.get_scraper("page1").html_file # type: ignore # always set after downloading
+    # the count is near the top, so a mapped page is only read up to there
+    with html_file.open_buffer() as buffer:
+        match: re.Match[bytes] | None = records_pattern.search(buffer)
+        if match is None:
+            print("\n", "Could not check the cached number of pages, as the first page does not show the meteorite count.", sep="")
+            return
 
-def download_pages(scraper: MultiScraper) -> None:
+        meteor_count: int = int(match.group(1))
+    write_cached_count(meteor_count)
+
+    old_page_count: int = len(scraper.pages)
+    page_count: int = count_pages(meteor_count)
+    if page_count == old_page_count:
+        return
+
+    print("\n", f"Number of pages changed from {old_page_count} to {page_count} since the last run.", sep="")
+    if page_count < old_page_count:
+        scraper.remove_pages([f"page{i}" for i in range(page_count + 1, old_page_count + 1)])
+        return
+
+    missing_pages: dict[str, str] = {f"page{i}": url + f"&page={i}" for i in range(old_page_count + 1, page_count + 1)}
+    scraper.add_pages(missing_pages)
+    yield from download_pages(scraper, page_names=list(missing_pages.keys()))
+
+
+# yields the names of the pages as soon as they are downloaded, so they can be parsed while the rest are still downloading
+def download_pages(scraper: MultiScraper, page_names: list[str] | None=None, force: bool | None=None) -> Iterator[str]:
     print(f"Starting HTML download...", "\n", sep="")
     start_time: float = time.time()
 
-    # initialise the scrapers (download HTML files)
-    scraper.init_scrapers(html_data_dir, args.threads, force=args.force, clear=args.clear)
+    # initialise the scrapers (download HTML files), only clear the directory when downloading everything
+    page_name: str
+    for page_name in scraper.iter_scrapers(
+        html_data_dir,
+        args.threads,
+        force=args.force if force is None else force,
+        clear=args.clear and page_names is None,
+        engine=args.engine,
+        revalidate=args.revalidate,
+        page_names=page_names
+    ):
+        page_scraper: PageScraper = scraper.get_scraper(page_name)
+        metrics.record(
+            "download",
+            page=page_name,
+            status=page_scraper.status,
+            bytes=page_scraper.downloaded,
+            seconds=page_scraper.latency,
+            attempts=page_scraper.attempts,
+            modified=page_scraper.modified,
+            failed=scraper.is_failed(page_name)
+        )
+
+        if not scraper.is_failed(page_name):
+            print(f"Page '{page_name}' is being parsed with {scraper.get_scraper(page_name).html_file}")
+        # downloads keep going while a page is parsed, so this is as of when the parsing of the last page finished
+        if scraper.progress is not None:
+            print(f"Download progress: {scraper.progress.format()}")
+        yield page_name
 
     end_time: float = time.time()
 
-    for page_name in scraper.scrapers.keys():
-        print(f"Page '{page_name}' is being parsed with {scraper.scrapers[page_name].html_file}")
     print("\n", f"Downloading finished, took about: {round(end_time - start_time, 5)}s", sep = "")
+    if scraper.concurrency is not None:
+        print(f"Adaptive download concurrency ended at {scraper.concurrency.get_limit()}.")
+
+    # report the pages that could not be downloaded even after retrying
+    if scraper.failures:
+        print("\n", f"Failed to download {len(scraper.failures)} out of {len(scraper.pages)} pages:", sep="")
+        for page_name, error in scraper.failures.items():
+            print(f"Page '{page_name}' ({scraper.pages[page_name]}): {error!r}")
+
+
+def read_incremental_state(url: str) -> dict[str, Any] | None:
+    if not incremental_state_file.exists():
+        return None
+
+    try:
+        states: dict[str, dict[str, Any]] = incremental_state_file.read_json()
+    except ValueError: # broken state is the same as no state
+        return None
+
+    return states.get(url)
+
+
+def write_incremental_state(url: str, page_count: int, tail_names: list[MeteoriteValue]) -> None:
+    states: dict[str, dict[str, Any]] = {}
+    if incremental_state_file.exists():
+        try:
+            states = incremental_state_file.read_json()
+        except ValueError:
+            pass
+
+    states[url] = { "page_count": page_count, "tail_names": tail_names }
+    incremental_state_file.write_json(states, force=True)
+
+
+# names of the meteorites on a saved page, in order
+def get_page_names(html_file: HTMLFile) -> list[MeteoriteValue]:
+    page_variables: list[str]
+    page_rows: list[list[MeteoriteValue]]
+    page_variables, page_rows, *_ = parse_html_file(html_file, args.parser_backend)
+    if not "Name" in page_variables:
+        return []
+
+    name_index: int = page_variables.index("Name")
+    return [row[name_index] for row in page_rows if len(row) > name_index]
+
+
+# remember where this run ended, so the next `--incremental` run can continue from there
+# only `--incremental` runs save it, since it costs parsing the last page again (without state the next one downloads everything)
+def save_incremental_state(scraper: MultiScraper, url: str) -> None:
+    # a page missing in the middle would be taken as up to date next time
+    if not args.incremental or scraper.failures:
+        return
+
+    last_page: str = f"page{len(scraper.pages)}"
+    if not scraper.is_used(last_page):
+        return
+
+    write_incremental_state(url, len(scraper.pages), get_page_names(scraper.get_scraper(last_page).html_file)) # type: ignore # always set after downloading
+
+
+# keep `data/html/` within `--cache-size` and `--cache-age`, never removing the pages of this run
+def evict_html(scraper: MultiScraper) -> None:
+    if args.cache_size <= 0 and args.cache_age <= 0:
+        return
+
+    used_files: list[HTMLFile] = [scraper.get_scraper(page_name).html_file for page_name in scraper.pages.keys() if scraper.is_used(page_name)] # type: ignore # always set after downloading
+    removed: list[HTMLFile] = html_data_dir.evict(max_size=int(args.cache_size*1024*1024), max_age=args.cache_age*24*60*60, keep=used_files)
+    if removed:
+        print("\n", f"Removed {len(removed)} pages from {html_data_dir} to keep it within the cache limits.", sep="")
+
+
+# the pages from the last page of the previous run onwards, or `None` if everything has to be downloaded again
+def get_changed_pages(scraper: MultiScraper, url: str) -> tuple[list[str], list[MeteoriteValue]] | None:
+    state: dict[str, Any] | None = read_incremental_state(url)
+    if state is None:
+        print("No previous run of this search to continue from, downloading every page.")
+        return None
+
+    old_page_count: int = state["page_count"]
+    if old_page_count > len(scraper.pages):
+        print(f"Number of pages dropped from {old_page_count} to {len(scraper.pages)} since the last run, downloading every page.")
+        return None
+
+    # pages before the last one of the previous run are used as they are, so they have to still be saved
+    i: int
+    for i in range(1, old_page_count):
+        if not html_data_dir.get_file(scraper.pages[f"page{i}"]).exists():
+            print(f"Page 'page{i}' of the previous run is not saved anymore, downloading every page.")
+            return None
+
+    return [f"page{i}" for i in range(old_page_count, len(scraper.pages) + 1)], state["tail_names"]
+
+
+# only downloads the pages that can have new meteorites, then checks they were really only added at the end
+# if they were not (e.g. the sort order puts them in between), the rest of the pages are downloaded as well
+def download_incremental(scraper: MultiScraper, changed_pages: list[str], tail_names: list[MeteoriteValue]) -> Iterator[str]:
+    print(f"Continuing from the last run, {len(changed_pages)} out of {len(scraper.pages)} pages can have changed.")
+    yield from download_pages(scraper, page_names=changed_pages, force=True)
+
+    boundary_page: str = changed_pages[0]
+    appended: bool = False
+    if not scraper.is_failed(boundary_page):
+        # the last page of the previous run has to start with the same meteorites it had back then
+        boundary_names: list[MeteoriteValue] = get_page_names(scraper.get_scraper(boundary_page).html_file) # type: ignore # always set after downloading
+        appended = boundary_names[:len(tail_names)] == tail_names
+
+    unchanged_pages: list[str] = [page_name for page_name in scraper.pages.keys() if not page_name in changed_pages]
+    if not appended:
+        print("\n", "Meteorites were not only added at the end since the last run, downloading the other pages as well.", sep="")
+    yield from download_pages(scraper, page_names=unchanged_pages, force=not appended)
+
+
+#===================TRANSFORM TABLES====================#
+# compiled once, since the transforms run for every cell of every page
+# grab the first number and ignore the rest and possibly a unit (some meteorites have years like "1967 or 1927")
+year_pattern: re.Pattern[str] = re.compile(r"^.*?(?P<first_number>\d+\.?\d*).*?(?P<unit>(?:[a-zA-Z]?a)?)$")
+mass_pattern: re.Pattern[str] = re.compile(r"^(?P<amount>\d+\.?\d*)\s+(?P<unit>t|T|(?:[a-zA-Z]?g))$")
+ll_pattern: re.Pattern[str] = re.compile(r"\(([-|+]?\d+\.\d+),\s+([-|+]?\d+\.\d+)\)")
+unknown_pattern: re.Pattern[str] = re.compile(r"^\(?unknown\)?$", flags=re.IGNORECASE)
+
+# craters have their age stored in year column, making this more complex
+year_conversion: dict[str, int] = {
+    "ma": 1_000_000,
+    "ka": 1_000,
+    "a": 1,
+    "": 1 # if no unit found also just multiply by one
+}
+mass_conversion: dict[str, float] = {
+    "t": 1_000_000.0,
+    "kg": 1_000.0,
+    "g": 1.0,
+    "mg": 0.001
+}
+#=======================================================#
 
 
 def transform_year(data: str) -> int | float | str:
-    # grab the first number and ignore the rest and possibly a unit (some meteorites have years like "1967 or 1927")
     # not statistically the best, it would be better to drop them
-    match_year: re.Match[str] | None = re.match(r"^.*?(?P<first_number>\d+\.?\d*).*?(?P<unit>(?:[a-zA-Z]?a)?)$", data)
+    match_year: re.Match[str] | None = year_pattern.match(data)
 
     if not match_year is None:
-        # craters have their age stored in year column, making this more complex
-        conversion: dict[str, int] = {
-            "ma": 1_000_000,
-            "ka": 1_000,
-            "a": 1,
-            "": 1 # if no unit found also just multiply by one
-        }
-
-        unit: str = match_year.groupdict()["unit"].lower()
-        number_match: str = match_year.groupdict()["first_number"]
+        unit: str = match_year.group("unit").lower()
+        number_match: str = match_year.group("first_number")
         # if we found a unit or a float, we have a crater and return a float, otherwise just and integer will do
         first_number: int | float = int(number_match) if unit == "" and number_match.isdecimal() else float(number_match)
 
-        return conversion[unit]*first_number
+        return year_conversion[unit]*first_number
 
     # if no match, delete the field
     return ""
 
 
 def transform_mass(data: str) -> float | str:
-    match_mass: re.Match[str] | None = re.match(r"^(?P<amount>\d+\.?\d*)\s+(?P<unit>t|T|(?:[a-zA-Z]?g))$", data)
+    match_mass: re.Match[str] | None = mass_pattern.match(data)
 
     if not match_mass is None:
-        conversion: dict[str, float] = {
-            "t": 1_000_000.0,
-            "kg": 1_000.0,
-            "g": 1.0,
-            "mg": 0.001
-        }
+        unit: str = match_mass.group("unit").lower()
+        amount: float = float(match_mass.group("amount"))
 
-        unit: str = match_mass.groupdict()["unit"].lower()
-        amount: float = float(match_mass.groupdict()["amount"])
-
-        return conversion[unit]*amount
+        return mass_conversion[unit]*amount
 
     # if no match, delete the field
     return ""
 
 
 def transform_ll(data: str) -> tuple[float, float] | str:
-    match_ll: re.Match[str] | None = re.match(r"\(([-|+]?\d+\.\d+),\s+([-|+]?\d+\.\d+)\)", data)
+    match_ll: re.Match[str] | None = ll_pattern.match(data)
 
     # will match if value is (Lat, Long), then convert it into tuple of floats
     if not match_ll is None:
@@ -178,118 +499,493 @@ def transform_ll(data: str) -> tuple[float, float] | str:
     return ""
 
 
-def transform_data(data: str, data_variable: str) -> MeteoriteValue:
-    # replace non-breaking space with normal whitespace
-    data = unicodedata.normalize("NFKC", data)
-    # remove any other unicode character
-    data = data.encode("ascii", "ignore").decode().strip()
+# approprite transform based on column type, columns not listed only get cleaned up
+which_transform: dict[str, Callable[[str], MeteoriteValue]] = {
+    "Year": transform_year,
+    # "Place": transform_place,
+    "Mass": transform_mass,
+    "(Lat,Long)": transform_ll
+}
+
+
+def transform_cell(data: str, transform: Callable[[str], MeteoriteValue] | None) -> MeteoriteValue:
+    if data.isascii():
+        # normalizing and dropping unicode does nothing to ascii, which most cells are
+        data = data.strip()
+    else:
+        # replace non-breaking space with normal whitespace
+        data = unicodedata.normalize("NFKC", data)
+        # remove any other unicode character
+        data = data.encode("ascii", "ignore").decode().strip()
 
     # if field is empty or unknown, we want to skip transforming
-    match_unknown: re.Match[str] | None = re.match(r"^\(?unknown\)?$", data, flags=re.IGNORECASE)
-    if data == "" or not match_unknown is None:
+    if data == "" or not unknown_pattern.match(data) is None:
         return ""
 
-    which_transform: dict[str, Callable[[str], MeteoriteValue]] = {
-        "Year": transform_year,
-        # "Place": transform_place,
-        "Mass": transform_mass,
-        "(Lat,Long)": transform_ll
-    }
-
     # return valid numbers right away (isdecimal is False for negative numbers)
     if data.removeprefix("-").isdecimal():
         return int(data)
 
-    # use approprite transform based on column type
-    if data_variable in which_transform.keys():
-        return which_transform[data_variable](data)
+    if not transform is None:
+        return transform(data)
 
     # remaining data needs to be stripped of special characters like "*" and "#"
     return data.rstrip(" *#")
 
 
-# parse the page and get variable names and resulting data in JSON-like form
-def parse_page(page_scraper: PageScraper) -> tuple[list[str], list[MeteoriteDict]]:
+def transform_data(data: str, data_variable: str) -> MeteoriteValue:
+    return transform_cell(data, which_transform.get(data_variable))
+
+
+# bounded memo per column in front of `transform_cell`, since most columns only have a handful of distinct values
+# every process has its own memos, created when a column is first seen
+column_memos: dict[str, "functools._lru_cache_wrapper[MeteoriteValue]"] = {}
+
+
+def get_column_memo(data_variable: str) -> Callable[[str], MeteoriteValue]:
+    transform: Callable[[str], MeteoriteValue] | None = which_transform.get(data_variable)
+    if args.memo_size <= 0:
+        return functools.partial(transform_cell, transform=transform)
+
+    if not data_variable in column_memos.keys():
+        column_memos[data_variable] = functools.lru_cache(maxsize=args.memo_size)(functools.partial(transform_cell, transform=transform))
+
+    return column_memos[data_variable]
+
+
+# hits and misses of every column memo so far
+def get_memo_stats() -> dict[str, tuple[int, int]]:
+    return {variable: (memo.cache_info().hits, memo.cache_info().misses) for variable, memo in column_memos.items()}
+
+
+# look up the transform of every column once per page instead of once per cell
+def get_column_transforms(variables: list[str]) -> list[Callable[[str], MeteoriteValue]]:
+    return [get_column_memo(variable) for variable in variables]
+
+
+# find the results table of the page and get the variable names and the table rows holding the data
+def find_page_table(page_scraper: PageScraper) -> tuple[list[str], list]: # type: ignore # list of bs4 tags
     # skipping typing for BeautifulSoup due to annoying None type
     table = page_scraper.parser.find("table", { "id": "maintable" }) # type: ignore
+    # pages past the last result (possible with a stale cached page count) have no table
+    if table is None:
+        return [], []
+
     table_rows = table.find_all("tr") # type: ignore
 
     table_head = table_rows[0] # type: ignore
     thead_variables: list[str] = [th.text.strip() for th in table_head.find_all("th", { "class": "insidehead" })]
 
-    page_metdict_list: list[MeteoriteDict] = []
+    return thead_variables, table_rows[1:]
 
-    i: int
-    for i in range(1, len(table_rows)):
-        row = table_rows[i] # type: ignore
-        data: list[MeteoriteValue] = [transform_data(td.text, thead_variables[j]) for j, td in enumerate(row.find_all("td"))]
 
-        # zip the variables and data, filter the empty data then make a dictionary
-        meteorite_dict: MeteoriteDict = dict(filter(lambda t: t[1] != "", zip(thead_variables, data)))
-        page_metdict_list.append(meteorite_dict)
+# parse the page and get variable names and the resulting rows of data, with empty strings for missing data
+def parse_page_rows(page_scraper: PageScraper) -> tuple[list[str], list[list[MeteoriteValue]]]:
+    thead_variables: list[str]
+    thead_variables, table_rows = find_page_table(page_scraper)
 
-    return thead_variables, page_metdict_list
+    column_transforms: list[Callable[[str], MeteoriteValue]] = get_column_transforms(thead_variables)
+    page_rows: list[list[MeteoriteValue]] = []
 
+    for row in table_rows:
+        page_rows.append([column_transforms[j](td.text) for j, td in enumerate(row.find_all("td"))])
 
-def parse_all_pages(scraper: MultiScraper, json_file: JSONFile, csv_file: CSVFile) -> None:
-    metdict_list: list[MeteoriteDict] = []
-    all_variables: dict[str, str] = {} # make dict instead of set data somewhat ordered
+    return thead_variables, page_rows
 
-    page_name: str
-    for page_name in scraper.pages.keys():
-        page_scraper: PageScraper = scraper.get_scraper(page_name)
 
-        print("\n", f"Starting parsing for '{page_name}'...", sep="")
-        start_time: float = time.time()
+def rows_to_metdicts(variables: list[str], rows: list[list[MeteoriteValue]]) -> list[MeteoriteDict]:
+    # zip the variables and data, filter the empty data then make a dictionary
+    return [dict(filter(lambda t: t[1] != "", zip(variables, data))) for data in rows]
+
+
+# parse the page and get variable names and resulting data in JSON-like form
+def parse_page(page_scraper: PageScraper) -> tuple[list[str], list[MeteoriteDict]]:
+    thead_variables: list[str]
+    page_rows: list[list[MeteoriteValue]]
+    thead_variables, page_rows = parse_page_rows(page_scraper)
+
+    return thead_variables, rows_to_metdicts(thead_variables, page_rows)
+
+
+# split the location into the separate columns of `typed_schema`
+def to_typed_metdict(metdict: MeteoriteDict) -> MeteoriteDict:
+    typed_metdict: MeteoriteDict = {variable: value for variable, value in metdict.items() if variable != "(Lat,Long)"}
+
+    lat_long: MeteoriteValue | None = metdict.get("(Lat,Long)")
+    if isinstance(lat_long, tuple):
+        typed_metdict["Latitude"], typed_metdict["Longitude"] = lat_long
+
+    return typed_metdict
+
+
+# text of a cell like BeautifulSoup would give it, without any tags and with entities replaced
+def cell_text(raw: bytes) -> str:
+    return html.unescape(tag_pattern.sub(b"", raw).decode("utf-8", errors="replace"))
+
 
-        page_scraper.start_parser()
-        page_variables: list[str]
-        page_metdict_list: list[MeteoriteDict]
-        page_variables, page_metdict_list = parse_page(page_scraper)
+# the `regex` backend, pulling the variable names and raw cells of the results table straight out of the undecoded page
+# works on any bytes-like buffer, so a memory-mapped page is never copied as a whole
+def extract_buffer_rows(buffer: bytes | bytearray | memoryview | Any) -> tuple[list[str], list[list[str]]]:
+    table_match: re.Match[bytes] | None = table_pattern.search(buffer)
+    # pages past the last result (possible with a stale cached page count) have no table
+    if table_match is None:
+        return [], []
+
+    end_match: re.Match[bytes] | None = table_end_pattern.search(buffer, table_match.end())
+    table_end: int = len(buffer) if end_match is None else end_match.start()
+
+    raw_rows: list[bytes] = [row_match.group(1) for row_match in row_pattern.finditer(buffer, table_match.end(), table_end)]
+    if not raw_rows:
+        return [], []
+
+    thead_variables: list[str] = [cell_text(raw).strip() for raw in head_cell_pattern.findall(raw_rows[0])]
+    return thead_variables, [[cell_text(raw) for raw in cell_pattern.findall(raw_row)] for raw_row in raw_rows[1:]]
+
+
+# transform raw cells the same way `parse_page_rows` transforms the cells of a parsed page
+def transform_raw_rows(variables: list[str], raw_rows: list[list[str]]) -> list[list[MeteoriteValue]]:
+    column_transforms: list[Callable[[str], MeteoriteValue]] = get_column_transforms(variables)
+    return [[column_transforms[j](cell) for j, cell in enumerate(raw_row)] for raw_row in raw_rows]
+
+
+# start the parser of the page with the given backend (see `--parser`)
+def start_page_parser(page_scraper: PageScraper, backend: str) -> None:
+    if backend != "fast":
+        page_scraper.start_parser(backend)
+        return
+
+    # everything we need is in the results table, so the tree for the rest of the page is never built
+    parser_type: str = "lxml" if bs.builder.builder_registry.lookup("lxml") is not None else "html.parser"
+    page_scraper.start_parser(parser_type, parse_only=bs.SoupStrainer("table", { "id": "maintable" }))
+
+
+# bump whenever the parsing or transform code changes what a page is parsed into, so results parsed by older code are not used anymore
+parse_version: int = 1
+
+
+# what a parsed page depends on, the page itself, the code that parsed it and the parser backend (see `--parser`)
+# the backends can disagree on broken HTML, so a page parsed by one is never reused by another
+def get_parse_key(html_file: HTMLFile, backend: str) -> str:
+    return f"{html_file.content_hash()}-{backend}-v{parse_version}"
+
+
+# get the result of parsing the same page before, if there is one
+def read_cached_parse(html_file: HTMLFile, parse_key: str) -> ParseResult | None:
+    start_time: float = time.time()
+    parsed: Any = html_file.read_parsed(parse_key)
+    if parsed is None:
+        return None
+
+    # nothing was transformed, so the memos were not used
+    return parsed[0], parsed[1], time.time() - start_time, {}, 0
+
+
+# parse a saved page on its own, also returning how long it took and how much the transform memos helped
+# only takes and returns picklable data, so it can run in a worker process
+def parse_html_file(html_file: HTMLFile, backend: str="fast") -> ParseResult:
+    start_time: float = time.time()
+    memo_stats: dict[str, tuple[int, int]] = get_memo_stats()
+
+    thead_variables: list[str]
+    page_rows: list[list[MeteoriteValue]]
+    if backend == "regex":
+        raw_rows: list[list[str]]
+        with html_file.open_buffer() as buffer:
+            thead_variables, raw_rows = extract_buffer_rows(buffer)
+        page_rows = transform_raw_rows(thead_variables, raw_rows)
+    else:
+        page_scraper: PageScraper = PageScraper("", html_file=html_file)
+        start_page_parser(page_scraper, backend)
+        thead_variables, page_rows = parse_page_rows(page_scraper)
         page_scraper.stop_parser()
 
-        metdict_list.extend(page_metdict_list)
-        # keep track of all the variables for later (needed for CSV file)
-        all_variables.update(dict(zip(page_variables, [""]*len(page_variables))))
+    # every cell went through the transform of its column, whether a memo answered it or not (or there is no memo with `--memo-size 0`)
+    transforms: int = sum(len(row) for row in page_rows)
 
-        end_time: float = time.time()
-        print(f"Finished parsing '{page_name}'! Time taken: {round(end_time - start_time, 5)}s")
+    # only count what this page added, memos of a process are shared by all the pages it parses
+    page_memo_stats: dict[str, tuple[int, int]] = {
+        variable: (hits - memo_stats.get(variable, (0, 0))[0], misses - memo_stats.get(variable, (0, 0))[1])
+        for variable, (hits, misses) in get_memo_stats().items()
+    }
 
-    # always over-write output file
-    json_file.write_json(metdict_list, force=True)
-    # keys of `all_variables` are fieldnames for the CSV file
-    # always over-write output file
-    csv_file.write_dict(all_variables.keys(), metdict_list, force=True)
+    return thead_variables, page_rows, time.time() - start_time, page_memo_stats, transforms
+
+
+# parse a saved page and keep the result next to it for the next run (see `read_cached_parse`)
+# like `parse_html_file` it can run in a worker process, so the result is only pickled there
+def parse_and_cache(html_file: HTMLFile, parse_key: str, backend: str="fast") -> ParseResult:
+    result: ParseResult = parse_html_file(html_file, backend)
+    html_file.write_parsed(parse_key, (result[0], result[1]))
+
+    return result
+
+
+# parses the pages in the order they are given (e.g. as they finish downloading), but writes them in page order
+# with more than one worker, pages are parsed in a process pool while the main process keeps handing out new ones
+# every page is written as soon as all the pages before it are, so only pages parsed out of order are kept in memory
+# returns whether any page was written, nothing is written (or over-written) when every page failed
+def parse_all_pages(
+    scraper: MultiScraper,
+    page_names: Iterable[str],
+    json_file: JSONFile | NDJSONFile,
+    csv_file: CSVFile,
+    parquet_file: ParquetFile | None=None,
+    sqlite_file: SQLiteFile | None=None,
+    workers: int=1,
+    backend: str="fast",
+    parse_cache: bool=True,
+    stale_files: Iterable[File]=()
+) -> bool: # break arguments into seperate lines to avoid line being to long
+    # pages waiting for the ones before them, kept as compact tables (the rows themselves are dropped right away)
+    page_tables: dict[str, ColumnTable] = {}
+    written_pages: set[str] = set()
+    memo_stats: dict[str, list[int]] = {}
+
+    # the outputs are only over-written once there is a page to write, so a run where every page failed keeps the outputs of the last one
+    with ExitStack() as output_streams:
+        write_json: Callable[[Iterable[Any]], None] | None = None
+        write_csv: Callable[[Iterable[str], Iterable[dict[str, Any]]], None] | None = None
+        typed_writers: list[Callable[[Iterable[MeteoriteDict]], None]] = []
+
+        def open_outputs() -> tuple[Callable[[Iterable[Any]], None], Callable[[Iterable[str], Iterable[dict[str, Any]]], None]]:
+            # outputs of earlier runs with other options would otherwise be mistaken for the outputs of this run
+            stale_file: File
+            for stale_file in stale_files:
+                stale_file.remove()
+
+            # always over-write output files
+            json_stream: AbstractContextManager[Callable[[Iterable[Any]], None]] = json_file.stream_array(force=True) if isinstance(json_file, JSONFile) else json_file.stream_lines(force=True)
+            opened_json: Callable[[Iterable[Any]], None] = output_streams.enter_context(json_stream)
+            opened_csv: Callable[[Iterable[str], Iterable[dict[str, Any]]], None] = output_streams.enter_context(csv_file.stream_dict(force=True))
+
+            # the typed outputs are optional, so only open the ones that were asked for
+            if parquet_file is not None:
+                typed_writers.append(output_streams.enter_context(parquet_file.stream_records(typed_schema, force=True)))
+            if sqlite_file is not None:
+                # never over-written, meteorites scraped again are updated in place
+                typed_writers.append(output_streams.enter_context(sqlite_file.stream_records("meteorites", typed_schema, key="Name", indexes=sqlite_indexes)))
+
+            return opened_json, opened_csv
+
+        def write_ready_pages() -> None:
+            nonlocal write_json, write_csv
+
+            # pages removed while downloading (stale cached page count) are not part of `scraper.pages` anymore
+            page_name: str
+            for page_name in scraper.pages.keys():
+                if page_name in written_pages or scraper.is_failed(page_name):
+                    continue
+                if not page_name in page_tables.keys():
+                    # every page after this one has to wait for it
+                    return
+
+                if write_json is None or write_csv is None:
+                    write_json, write_csv = open_outputs()
+
+                page_table: ColumnTable = page_tables.pop(page_name)
+                with metrics.timer("write", page=page_name, rows=len(page_table)):
+                    # dictionaries are only built for one page at a time
+                    page_metdicts: list[MeteoriteDict] = list(page_table.iter_records())
+                    write_json(page_metdicts)
+                    # variables of the table are fieldnames for the CSV file, new ones are added as new columns
+                    write_csv(page_table.variables, page_metdicts)
+                    if typed_writers:
+                        typed_metdicts: list[MeteoriteDict] = [to_typed_metdict(metdict) for metdict in page_metdicts]
+                        for write_typed in typed_writers:
+                            write_typed(typed_metdicts)
+                written_pages.add(page_name)
+
+        def finish_parsing(page_name: str, result: ParseResult, cached: bool=False) -> None:
+            page_table: ColumnTable = ColumnTable()
+            page_table.add_rows(result[0], result[1])
+            page_tables[page_name] = page_table
+            print(f"Finished parsing '{page_name}'! Time taken: {round(result[2], 5)}s")
+
+            metrics.record(
+                "parse",
+                page=page_name,
+                seconds=result[2],
+                rows=len(result[1]),
+                cells=sum(len(row) for row in result[1]),
+                transforms=result[4],
+                memo_hits=sum(hits for hits, _ in result[3].values()),
+                memo_misses=sum(misses for _, misses in result[3].values()),
+                cached=cached
+            )
+
+            variable: str
+            hits: int
+            misses: int
+            for variable, (hits, misses) in result[3].items():
+                total: list[int] = memo_stats.setdefault(variable, [0, 0])
+                total[0] += hits
+                total[1] += misses
+
+            write_ready_pages()
+
+        # downloads are still running in other threads, which does not mix well with forking, so always spawn the workers
+        executor: cf.ProcessPoolExecutor | None = None
+        if workers > 1:
+            executor = cf.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            # shut down with the outputs, also when something below raises, so the workers never outlive the parsing
+            # pages not started yet are not worth waiting for then
+            output_streams.callback(executor.shutdown, wait=True, cancel_futures=True)
+        futures: dict[cf.Future[ParseResult], str] = {}
+        future: cf.Future[ParseResult]
+
+        page_iterator: Iterator[str] = iter(page_names)
+        while True:
+            # time spent waiting here is time the parsing is ahead of the downloads
+            with metrics.timer("wait"):
+                next_page: str | None = next(page_iterator, None)
+            if next_page is None:
+                break
+            page_name: str = next_page
+
+            # failed pages have nothing (or only an old version) to parse
+            if scraper.is_failed(page_name):
+                print("\n", f"Skipping parsing for '{page_name}', since it failed to download.", sep="")
+                write_ready_pages()
+                continue
+
+            html_file: HTMLFile = scraper.get_scraper(page_name).html_file # type: ignore # always set after downloading
+
+            # pages that did not change since they were last parsed do not have to be parsed again
+            parse_key: str = get_parse_key(html_file, backend)
+            cached_result: ParseResult | None = read_cached_parse(html_file, parse_key) if parse_cache else None
+            if cached_result is not None:
+                print("\n", f"Using the cached parse of '{page_name}'...", sep="")
+                finish_parsing(page_name, cached_result, cached=True)
+                continue
+
+            print("\n", f"Starting parsing for '{page_name}'...", sep="")
+            if executor is None:
+                finish_parsing(page_name, parse_and_cache(html_file, parse_key, backend))
+            else:
+                futures[executor.submit(parse_and_cache, html_file, parse_key, backend)] = page_name
+                # write whatever the workers finished in the meantime
+                for future in [future for future in futures.keys() if future.done()]:
+                    finish_parsing(futures.pop(future), future.result())
+
+        for future in cf.as_completed(futures):
+            finish_parsing(futures[future], future.result())
+
+        # pages held back by one that was removed afterwards (see `verify_page_count`) are not waiting anymore
+        write_ready_pages()
+
+    if memo_stats:
+        print("\n", "Transform memo hit rates:", sep="")
+        for variable, (hits, misses) in memo_stats.items():
+            print(f"'{variable}': {round(100*hits/max(hits + misses, 1), 1)}% ({hits} hits, {misses} misses)")
+
+    return len(written_pages) > 0
 
 
 def main() -> None:
     start_time: float = time.time()
 
     # get url with proper search options
-    url = get_url(sea=sea, sfor=sfor, valids=valids, stype=stype, lrec=lrec, map=map)
+    url = get_url(sea=sea, sfor=sfor, valids=valids, stype=stype, lrec=lrec, map=map, srt=srt)
 
     # need page count to know how many websites to scrape
-    page_count: int = get_page_count()
+    page_count: int
+    cached: bool
+    with metrics.timer("phase_count"):
+        page_count, cached = get_page_count()
     # function return -1 if no match was found
     if page_count == -1:
         print(f"Could not find number of pages. Aborting!")
         return
 
     pages: dict[str, str] = {f"page{i}": url + f"&page={i}" for i in range(1, page_count + 1)}
-    scraper: MultiScraper = MultiScraper(pages, headers=headers)
-
-    # start page downloading
-    download_pages(scraper)
+    # kept for the whole run, so every round of downloads continues from the limit the last one ended with
+    concurrency: ConcurrencyController | None = ConcurrencyController(args.threads, maximum=max(args.max_threads, args.threads)) if args.adaptive else None
+    scraper: MultiScraper = MultiScraper(
+        pages,
+        headers=headers,
+        retry_policy=retry_policy,
+        rate_limiter=rate_limiter,
+        concurrency=concurrency
+    )
+
+    # start page downloading, pages are handed over for parsing as soon as they are done
+    changed_pages: tuple[list[str], list[MeteoriteValue]] | None = get_changed_pages(scraper, url) if args.incremental else None
+    downloaded_pages: Iterator[str] = download_pages(scraper) if changed_pages is None else download_incremental(scraper, *changed_pages)
+    if cached:
+        downloaded_pages = itertools.chain(downloaded_pages, verify_page_count(scraper, url))
 
     # start HTML parsing and save to JSON and CSV file
-    json_file = JSONFile(data_dir, "output")
+    json_file: JSONFile | NDJSONFile = JSONFile(data_dir, "output") if args.output_format == "json" else NDJSONFile(data_dir, "output")
     # change delimiter to semicolon due to many values containing comma
     csv_file = CSVFile(data_dir, "output", delimiter=";")
-    parse_all_pages(scraper, json_file, csv_file)
+    parquet_file: ParquetFile | None = ParquetFile(data_dir, "output") if args.parquet else None
+    sqlite_file: SQLiteFile | None = SQLiteFile(data_dir, "output") if args.sqlite else None
+    # the analysis reads `data/output.parquet` first, so one left over from an earlier `--parquet` run would hide this one
+    # the SQLite database is updated in place on purpose, so it is kept
+    stale_files: list[File] = [] if args.parquet else [ParquetFile(data_dir, "output")]
+    # same for `data/output.ndjson` over `data/output.json`, only one of them can be from this run
+    stale_files.append(NDJSONFile(data_dir, "output") if args.output_format == "json" else JSONFile(data_dir, "output"))
+    # downloads run in the background of the parsing, so this is the time of both
+    written: bool
+    with metrics.timer("phase_download_parse", pages=page_count):
+        written = parse_all_pages(scraper, downloaded_pages, json_file, csv_file, parquet_file, sqlite_file, workers=args.parse_workers, backend=args.parser_backend, parse_cache=args.parse_cache, stale_files=stale_files)
+    scraper.close()
+
+    if not written:
+        print("\n", f"None of the pages could be downloaded and parsed, keeping the outputs of the last run. Aborting!", sep="")
+        return
+
+    with metrics.timer("phase_finish"):
+        save_incremental_state(scraper, url)
+        evict_html(scraper)
 
     end_time = time.time()
     print("\n", f"Parsing complete! The entire program ran for {round(end_time - start_time, 5)}s. Stopping...", sep="")
 
+    if args.metrics:
+        write_metrics()
+
+
+# write the measurements of the run and print their summary
+def write_metrics() -> None:
+    metrics.record("memory", peak_bytes=peak_memory())
+    metrics.write_ndjson(metrics_file)
+
+    print("\n", metrics.report(), sep="")
+    print(f"Wrote every measurement to {metrics_file}.")
+
+
+# run `main` under cProfile and tracemalloc, writing the slowest calls and the biggest allocations to `data/`
+# parse workers are separate processes, so only the parsing done in the main process shows up
+def profile_main() -> None:
+    tracemalloc.start()
+    profiler: cProfile.Profile = cProfile.Profile()
+    try:
+        profiler.runcall(main)
+    finally:
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        peak: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # same format as `cProfile.Profile.dump_stats`, so it can be opened with `pstats` or snakeviz
+        profiler.create_stats()
+        profile_stats_file.write_binary(lambda file: marshal.dump(profiler.stats, file), force=True) # type: ignore # stats are set by `create_stats`
+
+        def write_report(file: Any) -> None:
+            file.write(f"Peak traced memory: {round(peak/1024/1024, 3)} MB\n\n")
+            pstats.Stats(profiler, stream=file).sort_stats("cumulative").print_stats(40)
+
+            file.write("Biggest allocations still alive at the end:\n")
+            statistic: tracemalloc.Statistic
+            for statistic in snapshot.statistics("lineno")[:20]:
+                file.write(f"{statistic}\n")
+
+        profile_report_file.write(write_report, force=True)
+        print("\n", f"Wrote the profile to {profile_stats_file} and {profile_report_file}.", sep="")
+
 
 if __name__ == "__main__":
-    main()
+    if args.profile:
+        profile_main()
+    else:
+        main()
@@ -1,14 +1,21 @@
 import csv
+import gzip
+import hashlib
 import json
+import mmap
 import os
+import pickle
+import sqlite3
+import time
 
-from typing import Any, Callable, Iterable
-from io import TextIOWrapper
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Self
+from io import BufferedReader, BufferedWriter, TextIOWrapper
 
 
 # hack: inherit from string to allow using this class instead of path represented as string
 class Directory(str):
-    def __new__(cls, dir_path: str=".") -> "Directory": # have to use "Directory" since cannot use the class itself inside its definition
+    def __new__(cls, dir_path: str=".") -> Self:
         """
         Directory constructor.
         Creates the directory if it does not exist.
@@ -122,6 +129,11 @@ class File:
         return os.path.exists(self._path)
 
 
+    def _open(self, mode: str) -> Any:
+        # every read and write goes through here, so subclasses can change how the file is stored (see `HTMLFile`)
+        return open(self._path, mode, encoding=None if "b" in mode else "utf-8")
+
+
     def write(self, writer: Callable[[TextIOWrapper], None], force: bool=False) -> None:
         """
         Tries writing to file using `writer`.
@@ -136,7 +148,7 @@ class File:
         """
 
         if not self.exists() or force:
-            with open(self._path, "w", encoding="utf-8") as file:
+            with self._open("w") as file:
                 writer(file)
 
 
@@ -163,10 +175,102 @@ class File:
         if not self.exists():
             raise RuntimeError("File cannot be read, as it does not exist")
 
-        with open(self._path, "r", encoding="utf-8") as file:
+        with self._open("r") as file:
+            return reader(file)
+
+
+    def write_binary(self, writer: Callable[[BufferedWriter], None], force: bool=False) -> None:
+        """
+        Tries writing raw bytes to file using `writer`.
+        Does not over-write files unless `force` is set to `True` and removes the file if an error occured while writing.
+
+        Parameters
+        ----------
+        writer : Callable[[BufferedWriter], None]
+            | a callable object to be executed when file is opened, takes one parameter (BufferedWriter) representing the file to be written
+        force : bool, default=`False`
+            | whether to force over-writing the file
+        """
+
+        if not self.exists() or force:
+            try:
+                with self._open("wb") as file:
+                    writer(file)
+            except BaseException:
+                # do not leave half written files behind, they would be skipped next time without `force`
+                self.remove()
+                raise
+
+
+    def read_binary(self, reader: Callable[[BufferedReader], Any]) -> Any:
+        """
+        Tries reading the file as raw bytes using `reader`.
+
+        Parameters
+        ----------
+        reader : Callable[[BufferedReader], Any]
+            | a callable object to be executed when file is opened, the output of which will then be returned
+
+        Returns
+        -------
+        Any
+            | output of `reader`
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        if not self.exists():
+            raise RuntimeError("File cannot be read, as it does not exist")
+
+        with self._open("rb") as file:
             return reader(file)
 
 
+    @contextmanager
+    def open_buffer(self) -> Iterator[bytes | mmap.mmap]:
+        """
+        Opens the raw bytes of the file as a read-only buffer, memory-mapped so nothing is read or copied until it is used.
+        Works with anything accepting bytes-like objects (e.g. `re` patterns of bytes), but only inside the `with` block, as the mapping is closed afterwards.
+
+        Yields
+        ------
+        bytes | mmap.mmap
+            | the memory-mapped file (empty files cannot be mapped and are empty bytes instead)
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        if not self.exists():
+            raise RuntimeError("File cannot be read, as it does not exist")
+
+        with open(self._path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b""
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+
+
+    def size(self) -> int:
+        """
+        Gets the size the file takes up on disk (compressed if it is compressed).
+
+        Returns
+        -------
+        int
+            | size in bytes, `0` if the file does not exist
+        """
+
+        return os.path.getsize(self._path) if self.exists() else 0
+
+
     def remove(self) -> None:
         """
         Delete the file if it exists.
@@ -176,10 +280,56 @@ class File:
             os.remove(self._path)
 
 
+# file name extensions of the compressions HTML files can be stored with
+HTML_COMPRESSIONS: dict[str, str] = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst"
+}
+
+
+def _open_compressed(path: str, mode: str, compression: str) -> Any:
+    # opens the file at `path` like `open` would, compressing and decompressing it transparently
+    if compression == "none":
+        return open(path, mode, encoding=None if "b" in mode else "utf-8")
+
+    # compression libraries want the text mode spelled out
+    compressed_mode: str = mode if "b" in mode else mode + "t"
+    encoding: str | None = None if "b" in mode else "utf-8"
+
+    if compression == "gzip":
+        # files are written once and read many times, a middle level keeps writing fast while still shrinking them a lot
+        return gzip.open(path, compressed_mode, compresslevel=6, encoding=encoding)
+
+    # only import when needed, so everything else works without zstandard installed
+    try:
+        import zstandard
+    except ImportError as error:
+        raise RuntimeError("Storing files with zstd requires `zstandard` to be installed") from error
+
+    return zstandard.open(path, compressed_mode, encoding=encoding)
+
+
+def _remove_compressed(path: str, keep: str | None=None) -> None:
+    # removes the copies of the file at `path` (without the compression extension) stored with any compression other than `keep`
+    compression: str
+    extension: str
+    for compression, extension in HTML_COMPRESSIONS.items():
+        if compression != keep and os.path.exists(path + extension):
+            os.remove(path + extension)
+
+
 class HTMLFile(File):
-    def __init__(self, dir: Directory, filename: str) -> None:
+    compression: str
+    meta_file: "JSONFile" # JSONFile is defined further down
+    parsed_file: "PickleFile" # PickleFile is defined further down
+
+    def __init__(self, dir: Directory, filename: str, compression: str="none") -> None:
         """
         HTMLFile initialiser.
+        Every HTML file also has a small JSON sidecar (`filename.meta.json`) holding metadata about where and when it was downloaded,
+        and can have a pickled sidecar (`filename.parsed.pickle`) holding what was parsed out of it.
+        Compressed files are compressed and decompressed transparently, every method works with the HTML itself.
 
         Parameters
         ----------
@@ -187,15 +337,47 @@ class HTMLFile(File):
             | a Directory type representing where the file will be stored
         filename : str
             | name of the file without '.html'
+        compression : str, default=`"none"`
+            | how to store the file, one of `"none"`, `"gzip"` ('.html.gz') or `"zstd"` ('.html.zst', requires `zstandard`)
+
+        Raises
+        ------
+        ValueError
+            | when an unknown `compression` is supplied
         """
 
-        super().__init__(dir, filename + ".html")
+        if not compression in HTML_COMPRESSIONS.keys():
+            raise ValueError(f"Unknown HTML compression '{compression}'")
+
+        super().__init__(dir, filename + ".html" + HTML_COMPRESSIONS[compression])
+
+        self.compression = compression
+        self.meta_file = JSONFile(dir, filename + ".meta")
+        # what was parsed out of a page is about as big as the page, so it is compressed the same way
+        self.parsed_file = PickleFile(dir, filename + ".parsed", self.compression)
+
+
+    def _open(self, mode: str) -> Any:
+        return _open_compressed(self._path, mode, self.compression)
 
 
     def __str__(self) -> str:
         return f"<HTMLFile path={self._path}>"
 
 
+    def size(self) -> int:
+        """
+        Gets the size the page takes up on disk together with its sidecars (compressed if it is compressed).
+
+        Returns
+        -------
+        int
+            | size in bytes, `0` if nothing exists
+        """
+
+        return super().size() + self.meta_file.size() + self.parsed_file.size()
+
+
     def write_html(
         self,
         html: str,
@@ -254,6 +436,324 @@ class HTMLFile(File):
         return self.read(reader)
 
 
+    def write_html_chunks(self, chunks: Iterable[bytes], force: bool=False) -> None:
+        """
+        Writes the given chunks of undecoded HTML to the file one by one, so the whole page never has to be in memory.
+        Does not over-write unless `force` is set to `True`.
+        The chunks are only requested once the file is opened, so a lazy iterable is never consumed if the file is skipped.
+
+        Parameters
+        ----------
+        chunks : Iterable[bytes]
+            | an iterable of raw HTML bytes to write in order
+        force : bool, default=`False`
+            | whether to force over-writing the file
+        """
+
+        def custom_writer(file: BufferedWriter) -> None:
+            chunk: bytes
+            for chunk in chunks:
+                file.write(chunk)
+
+        self.write_binary(custom_writer, force=force)
+
+        # a copy stored with another compression (from an earlier run) would now be out of date
+        _remove_compressed(self._path.removesuffix(HTML_COMPRESSIONS[self.compression]), keep=self.compression)
+
+
+    def write_meta(self, meta: dict[str, Any]) -> None:
+        """
+        Over-writes the metadata sidecar of the HTML file.
+
+        Parameters
+        ----------
+        meta : dict[str, Any]
+            | metadata of the page (URL, ETag, Last-Modified, fetch time, size, hash), only JSON compatible values
+        """
+
+        self.meta_file.write_json(meta, force=True)
+
+
+    def update_meta(self, **kwargs: Any) -> None:
+        """
+        Updates the given fields of the metadata sidecar, keeping the rest as they are.
+        Does nothing if there is no metadata yet.
+        """
+
+        meta: dict[str, Any] | None = self.read_meta()
+        if meta is None:
+            return
+
+        meta.update(kwargs)
+        self.write_meta(meta)
+
+
+    def read_meta(self) -> dict[str, Any] | None:
+        """
+        Reads the metadata sidecar of the HTML file.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            | the metadata or `None` if it does not exist or cannot be read
+        """
+
+        if not self.meta_file.exists():
+            return None
+
+        try:
+            meta: Any = self.meta_file.read_json()
+        except ValueError: # broken sidecar is the same as no sidecar
+            return None
+
+        return meta if isinstance(meta, dict) else None
+
+
+    def content_hash(self) -> str:
+        """
+        Hashes the HTML itself, so the same page has the same hash no matter how it is compressed.
+
+        Returns
+        -------
+        str
+            | hexadecimal SHA-256 of the undecoded HTML, same as the `sha256` field of the metadata written while downloading
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        with self.open_buffer() as buffer:
+            return hashlib.sha256(buffer).hexdigest()
+
+
+    def write_parsed(self, key: str, parsed: Any) -> None:
+        """
+        Over-writes the parsed sidecar of the HTML file.
+
+        Parameters
+        ----------
+        key : str
+            | what the parsed data depends on (e.g. `content_hash` and the version of the parsing code), needed to read it back
+        parsed : Any
+            | data parsed out of the page, any picklable object
+        """
+
+        self.parsed_file.write_pickle({ "key": key, "parsed": parsed }, force=True)
+        self.parsed_file.remove_other_compressions()
+
+
+    def read_parsed(self, key: str) -> Any | None:
+        """
+        Reads the parsed sidecar of the HTML file, if it was written with the same `key`.
+
+        Parameters
+        ----------
+        key : str
+            | key the data was written with (see `write_parsed`)
+
+        Returns
+        -------
+        Any | None
+            | the parsed data or `None` if it does not exist, cannot be read or has a different key
+        """
+
+        if not self.parsed_file.exists():
+            return None
+
+        try:
+            entry: Any = self.parsed_file.read_pickle()
+        except Exception: # broken sidecar (e.g. half written by an interrupted run) is the same as no sidecar
+            return None
+
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+
+        return entry.get("parsed")
+
+
+    def remove(self) -> None:
+        """
+        Delete the file and its sidecars if they exist.
+        """
+
+        super().remove()
+        self.meta_file.remove()
+        self.parsed_file.remove()
+        self.parsed_file.remove_other_compressions()
+
+
+    @contextmanager
+    def open_buffer(self) -> Iterator[bytes | mmap.mmap]:
+        """
+        Opens the HTML as a read-only buffer of raw bytes (see `File.open_buffer`).
+        Uncompressed files are memory-mapped, compressed ones have to be decompressed into memory first.
+
+        Yields
+        ------
+        bytes | mmap.mmap
+            | the undecoded HTML
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        if self.compression != "none":
+            yield self.read_html_bytes()
+            return
+
+        with super().open_buffer() as buffer:
+            yield buffer
+
+
+    def read_html_bytes(self) -> bytes:
+        """
+        Reads the contents of the HTML file without decoding them.
+
+        Returns
+        -------
+        bytes
+            | HTML code as raw bytes
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        def custom_reader(file: BufferedReader) -> bytes:
+            return file.read()
+
+        return self.read_binary(custom_reader)
+
+
+class HTMLCache(Directory):
+    compression: str
+
+    def __new__(cls, dir_path: str=".", compression: str="gzip") -> Self:
+        """
+        HTMLCache constructor, a directory of HTML files named by the hash of the URL they were downloaded from.
+        The same page is only stored once, no matter which run or search downloaded it, and different searches never over-write each others pages.
+        Creates the directory if it does not exist.
+
+        Parameters
+        ----------
+        dir_path : str, default="."
+            | path to the directory
+        compression : str, default=`"gzip"`
+            | how to store the HTML files (see `HTMLFile`)
+
+        Raises
+        ------
+        ValueError
+            | when an unknown `compression` is supplied
+        """
+
+        if not compression in HTML_COMPRESSIONS.keys():
+            raise ValueError(f"Unknown HTML compression '{compression}'")
+
+        cache: Self = super().__new__(cls, dir_path)
+        cache.compression = compression
+
+        return cache
+
+
+    def get_file(self, url: str) -> HTMLFile:
+        """
+        Gets the HTML file the page at `url` is stored in (whether it exists yet or not).
+
+        Parameters
+        ----------
+        url : str
+            | URL of the page
+
+        Returns
+        -------
+        HTMLFile
+            | the file named by the hash of `url`
+        """
+
+        return HTMLFile(self, hashlib.sha256(url.encode("utf-8")).hexdigest()[:32], self.compression)
+
+
+    def list_files(self) -> list[HTMLFile]:
+        """
+        Gets all the HTML files stored in the cache, with any compression.
+
+        Returns
+        -------
+        list[HTMLFile]
+            | list of the stored HTML files
+        """
+
+        html_files: list[HTMLFile] = []
+
+        path: str
+        for path in self.listdir():
+            compression: str
+            extension: str
+            for compression, extension in HTML_COMPRESSIONS.items():
+                if path.endswith(".html" + extension):
+                    html_files.append(HTMLFile(self, path.removesuffix(".html" + extension), compression))
+                    break
+
+        return html_files
+
+
+    def evict(self, max_size: int=0, max_age: float=0.0, keep: Iterable[HTMLFile]=()) -> list[HTMLFile]:
+        """
+        Removes cached pages (and their sidecars) that are too old, then the least recently downloaded ones until the cache is small enough.
+
+        Parameters
+        ----------
+        max_size : int, default=`0`
+            | maximum total size of the stored pages in bytes, `0` for no limit
+        max_age : float, default=`0.0`
+            | maximum time in seconds since a page was downloaded or revalidated, `0.0` for no limit
+        keep : Iterable[HTMLFile], default=`()`
+            | files that are never removed (e.g. the ones in use)
+
+        Returns
+        -------
+        list[HTMLFile]
+            | the removed files
+        """
+
+        kept_paths: set[str] = {html_file._path for html_file in keep}
+        now: float = time.time()
+
+        def fetched(html_file: HTMLFile) -> float:
+            meta: dict[str, Any] | None = html_file.read_meta()
+            if meta is None or not isinstance(meta.get("fetched"), (int, float)):
+                return os.path.getmtime(html_file._path)
+            return meta["fetched"]
+
+        # oldest first, so those are the first to go when the cache is too big
+        html_files: list[tuple[float, HTMLFile]] = sorted(
+            ((fetched(html_file), html_file) for html_file in self.list_files() if not html_file._path in kept_paths),
+            key=lambda entry: entry[0]
+        )
+        total_size: int = sum(html_file.size() for html_file in self.list_files())
+        removed: list[HTMLFile] = []
+
+        fetch_time: float
+        html_file: HTMLFile
+        for fetch_time, html_file in html_files:
+            too_old: bool = max_age > 0 and now - fetch_time > max_age
+            too_big: bool = max_size > 0 and total_size > max_size
+            if not (too_old or too_big):
+                continue
+
+            total_size -= html_file.size()
+            html_file.remove()
+            removed.append(html_file)
+
+        return removed
+
+
 class CSVFile(File):
     delimiter: str
     quotechar: str
@@ -385,13 +885,88 @@ class CSVFile(File):
         self.write(writer, force=force)
 
 
-# mypy type checking requires use of --enable-incomplete-feature=NewGenericSyntax
-# custom types used later on to shorten typing annotations - REQUIRES PYTHON 3.12+!!!
+    @contextmanager
+    def stream_dict(self, force: bool=False) -> Iterator[Callable[[Iterable[str], Iterable[dict[str, Any]]], None]]:
+        """
+        Opens the CSV file for writing dictionaries in batches, as they become available.
+        The header is written with the field names of the first batch.
+        Field names first seen in a later batch are added as new columns, rewriting the header once the file is closed.
+        Does not over-write unless `force` is set to `True`, in which case the yielded callable writes nothing.
 
-class JSONFile(File):
-    def __init__(self, dir: Directory, filename: str) -> None:
-        """"
-        JSONFile initialiser.
+        Parameters
+        ----------
+        force : bool, default=`False`
+            | whether to force over-writing the file
+
+        Yields
+        ------
+        Callable[[Iterable[str], Iterable[dict[str, Any]]], None]
+            | a callable object taking field names and dictionaries of fieldname and value pairs (like `write_dict`), writing them to the end of the file
+        """
+
+        if self.exists() and not force:
+            yield lambda fieldnames, data: None
+            return
+
+        all_fieldnames: dict[str, None] = {} # make dict instead of set data somewhat ordered
+        header_length: int = -1
+
+        with open(self._path, "w", encoding="utf-8", newline="") as file:
+            # typing ignored due to weird csv._writer type being inaccessible
+            csv_writer = csv.writer(file, # type: ignore
+                delimiter=self.delimiter,
+                quotechar=self.quotechar,
+                quoting=csv.QUOTE_MINIMAL
+            )
+
+            def write_data(fieldnames: Iterable[str], data: Iterable[dict[str, Any]]) -> None:
+                nonlocal header_length
+                all_fieldnames.update(dict.fromkeys(fieldnames))
+                if header_length == -1:
+                    csv_writer.writerow(all_fieldnames.keys())
+                    header_length = len(all_fieldnames)
+
+                row_dict: dict[str, Any]
+                for row_dict in data:
+                    all_fieldnames.update(dict.fromkeys(row_dict.keys()))
+                    csv_writer.writerow([row_dict.get(fieldname, "") for fieldname in all_fieldnames.keys()])
+                # make every batch visible right away
+                file.flush()
+
+            yield write_data
+
+            # an empty file still gets its (empty) header line, like `write_dict` would write
+            if header_length == -1:
+                csv_writer.writerow([])
+                header_length = 0
+
+        if len(all_fieldnames) > header_length:
+            self._rewrite_header(list(all_fieldnames.keys()))
+
+
+    def _rewrite_header(self, fieldnames: list[str]) -> None:
+        # new fields are always added at the end, so the rows written before them only need padding
+        temp_path: str = self._path + ".tmp"
+        with open(self._path, "r", encoding="utf-8", newline="") as old_file, open(temp_path, "w", encoding="utf-8", newline="") as new_file:
+            csv_reader = csv.reader(old_file, delimiter=self.delimiter, quotechar=self.quotechar) # type: ignore
+            csv_writer = csv.writer(new_file, delimiter=self.delimiter, quotechar=self.quotechar, quoting=csv.QUOTE_MINIMAL) # type: ignore
+
+            next(csv_reader, None) # skip the old header
+            csv_writer.writerow(fieldnames)
+            row: list[str]
+            for row in csv_reader:
+                csv_writer.writerow(row + [""]*(len(fieldnames) - len(row)))
+
+        os.replace(temp_path, self._path)
+
+
+# mypy type checking requires use of --enable-incomplete-feature=NewGenericSyntax
+# custom types used later on to shorten typing annotations - REQUIRES PYTHON 3.12+!!!
+
+class JSONFile(File):
+    def __init__(self, dir: Directory, filename: str) -> None:
+        """"
+        JSONFile initialiser.
 
         Parameters
         ----------
@@ -439,7 +1014,64 @@ class JSONFile(File):
         self.write(writer, force=force)
 
 
-    def read_json(self, reader: Callable[[TextIOWrapper], Any]) -> Any:
+    @contextmanager
+    def stream_array(self, force: bool=False) -> Iterator[Callable[[Iterable[Any]], None]]:
+        """
+        Opens the JSON file for writing an array in batches, as the items become available.
+        The array is formatted like `write_json` would format a list and is closed once the file is.
+        Does not over-write unless `force` is set to `True`, in which case the yielded callable writes nothing.
+
+        Parameters
+        ----------
+        force : bool, default=`False`
+            | whether to force over-writing the file
+
+        Yields
+        ------
+        Callable[[Iterable[Any]], None]
+            | a callable object writing the given objects (see `write_json`) to the end of the array
+        """
+
+        if self.exists() and not force:
+            yield lambda items: None
+            return
+
+        with open(self._path, "w", encoding="utf-8") as file:
+            separator: str = "[\n"
+
+            def write_items(items: Iterable[Any]) -> None:
+                nonlocal separator
+                for item in items:
+                    # indent every line of the item one level deeper, as it is inside the array
+                    file.write(separator + "\n".join("    " + line for line in json.dumps(item, indent=4).split("\n")))
+                    separator = ",\n"
+                # make every batch visible right away
+                file.flush()
+
+            yield write_items
+
+            file.write("[]" if separator == "[\n" else "\n]")
+
+
+    def write_json_array(self, items: Iterable[Any], force: bool=False) -> None:
+        """
+        Writes the given items to the JSON file as an array, formatted like `write_json` would format a list.
+        Items are serialised one at a time, so the whole array never has to be in memory.
+        Does not over-write unless `force` is set to `True`.
+
+        Parameters
+        ----------
+        items : Iterable[Any]
+            | an iterable of objects made up of only the types accepted by json library (see `write_json`)
+        force : bool, default=`False`
+            | whether to force over-writing the file
+        """
+
+        with self.stream_array(force=force) as write_items:
+            write_items(items)
+
+
+    def read_json(self, reader: Callable[[TextIOWrapper], Any] | None=None) -> Any:
         """
         Reads the contents of the HTML file.
         If a custom `reader` is supplied, returns the result of that instead.
@@ -466,3 +1098,533 @@ class JSONFile(File):
             reader = custom_reader
 
         return self.read(reader)
+
+
+class NDJSONFile(File):
+    def __init__(self, dir: Directory, filename: str) -> None:
+        """"
+        NDJSONFile initialiser, for newline-delimited JSON (one value per line).
+
+        Parameters
+        ----------
+        dir : Directory
+            | a Directory type representing where the file will be stored
+        filename : str
+            | name of the file without '.ndjson'
+        """
+
+        super().__init__(dir, filename + ".ndjson")
+
+
+    def __str__(self) -> str:
+        return f"<NDJSONFile path={self._path}>"
+
+
+    @contextmanager
+    def stream_lines(self, force: bool=False, append: bool=False) -> Iterator[Callable[[Iterable[Any]], None]]:
+        """
+        Opens the NDJSON file for writing values in batches, as they become available.
+        Does not over-write unless `force` is set to `True`, in which case the yielded callable writes nothing.
+        With `append` set to `True`, values are added to the end of the file instead (creating it if it does not exist).
+
+        Parameters
+        ----------
+        force : bool, default=`False`
+            | whether to force over-writing the file
+        append : bool, default=`False`
+            | whether to add to the end of the file instead of over-writing it
+
+        Yields
+        ------
+        Callable[[Iterable[Any]], None]
+            | a callable object writing the given objects (see `JSONFile.write_json`) to the end of the file, one per line
+        """
+
+        if self.exists() and not (force or append):
+            yield lambda items: None
+            return
+
+        with open(self._path, "a" if append else "w", encoding="utf-8") as file:
+            def write_items(items: Iterable[Any]) -> None:
+                file.writelines(json.dumps(item) + "\n" for item in items)
+                # make every batch visible right away
+                file.flush()
+
+            yield write_items
+
+
+    def write_ndjson(self, items: Iterable[Any], force: bool=False, append: bool=False) -> None:
+        """
+        Writes the given items to the NDJSON file, one per line.
+        Does not over-write unless `force` is set to `True`.
+        With `append` set to `True`, items are added to the end of the file instead (creating it if it does not exist).
+
+        Parameters
+        ----------
+        items : Iterable[Any]
+            | an iterable of objects made up of only the types accepted by json library (see `JSONFile.write_json`)
+        force : bool, default=`False`
+            | whether to force over-writing the file
+        append : bool, default=`False`
+            | whether to add to the end of the file instead of over-writing it
+        """
+
+        with self.stream_lines(force=force, append=append) as write_items:
+            write_items(items)
+
+
+    def iter_ndjson(self, chunk_size: int=1000) -> Iterator[list[Any]]:
+        """
+        Reads the NDJSON file in chunks, so only `chunk_size` values are in memory at once.
+        Empty lines are skipped.
+
+        Parameters
+        ----------
+        chunk_size : int, default=`1000`
+            | maximum number of values in every chunk
+
+        Yields
+        ------
+        list[Any]
+            | the next (up to) `chunk_size` values of the file, in order
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        ValueError
+            | when `chunk_size` is smaller than 1
+        """
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size has to be at least 1")
+        if not self.exists():
+            raise RuntimeError("File cannot be read, as it does not exist")
+
+        with open(self._path, "r", encoding="utf-8") as file:
+            chunk: list[Any] = []
+
+            line: str
+            for line in file:
+                if line.strip():
+                    chunk.append(json.loads(line))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
+
+
+    def read_ndjson(self) -> list[Any]:
+        """
+        Reads all the values of the NDJSON file.
+
+        Returns
+        -------
+        list[Any]
+            | the values of the file, in order
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        return [item for chunk in self.iter_ndjson() for item in chunk]
+
+
+class PickleFile(File):
+    compression: str
+
+    def __init__(self, dir: Directory, filename: str, compression: str="none") -> None:
+        """"
+        PickleFile initialiser, for Python objects that do not survive a round trip through JSON (e.g. tuples).
+        Only meant for files this program wrote itself, as unpickling runs whatever the file says.
+
+        Parameters
+        ----------
+        dir : Directory
+            | a Directory type representing where the file will be stored
+        filename : str
+            | name of the file without '.pickle'
+        compression : str, default=`"none"`
+            | how to store the file, same options as for `HTMLFile`
+
+        Raises
+        ------
+        ValueError
+            | when an unknown `compression` is supplied
+        """
+
+        if not compression in HTML_COMPRESSIONS.keys():
+            raise ValueError(f"Unknown compression '{compression}'")
+
+        super().__init__(dir, filename + ".pickle" + HTML_COMPRESSIONS[compression])
+
+        self.compression = compression
+
+
+    def _open(self, mode: str) -> Any:
+        return _open_compressed(self._path, mode, self.compression)
+
+
+    def __str__(self) -> str:
+        return f"<PickleFile path={self._path}>"
+
+
+    def remove_other_compressions(self) -> None:
+        """
+        Deletes the copies of the file stored with other compressions (e.g. by a run with another `--html-compression`).
+        """
+
+        _remove_compressed(self._path.removesuffix(HTML_COMPRESSIONS[self.compression]), keep=self.compression)
+
+
+    def write_pickle(self, data: Any, force: bool=False) -> None:
+        """
+        Writes the given object to the pickle file.
+        Does not over-write unless `force` is set to `True`.
+
+        Parameters
+        ----------
+        data : Any
+            | any picklable object
+        force : bool, default=`False`
+            | whether to force over-writing the file
+        """
+
+        def custom_writer(file: BufferedWriter) -> None:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.write_binary(custom_writer, force=force)
+
+
+    def read_pickle(self) -> Any:
+        """
+        Reads the object stored in the pickle file.
+
+        Returns
+        -------
+        Any
+            | the stored object
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        def custom_reader(file: BufferedReader) -> Any:
+            return pickle.load(file)
+
+        return self.read_binary(custom_reader)
+
+
+# column types the typed outputs (`ParquetFile`, `SQLiteFile`) understand
+COLUMN_TYPES: tuple[str, ...] = ("string", "category", "int64", "float64")
+
+
+def _convert_value(value: Any, column_type: str) -> Any:
+    # values not fitting the column (or missing ones) become nulls, the text outputs still hold them as they are
+    if value is None or value == "":
+        return None
+    if column_type in ("string", "category"):
+        return str(value)
+    if column_type == "int64":
+        return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _check_schema(schema: dict[str, str]) -> None:
+    unknown_types: set[str] = set(schema.values()) - set(COLUMN_TYPES)
+    if unknown_types:
+        raise ValueError(f"Unknown column types {sorted(unknown_types)}, expected one of {list(COLUMN_TYPES)}")
+
+
+class ParquetFile(File):
+    def __init__(self, dir: Directory, filename: str) -> None:
+        """"
+        ParquetFile initialiser, for typed columnar data (requires `pyarrow`).
+
+        Parameters
+        ----------
+        dir : Directory
+            | a Directory type representing where the file will be stored
+        filename : str
+            | name of the file without '.parquet'
+        """
+
+        super().__init__(dir, filename + ".parquet")
+
+
+    def __str__(self) -> str:
+        return f"<ParquetFile path={self._path}>"
+
+
+    @staticmethod
+    def _import_pyarrow() -> tuple[Any, Any]:
+        # only import when needed, so the other outputs work without pyarrow installed
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise RuntimeError("Parquet files require `pyarrow` to be installed") from error
+
+        return pa, pq
+
+
+    @contextmanager
+    def stream_records(self, schema: dict[str, str], force: bool=False) -> Iterator[Callable[[Iterable[dict[str, Any]]], None]]:
+        """
+        Opens the Parquet file for writing dictionaries in batches (one row group per batch), as they become available.
+        Every column has a fixed type, fields not in `schema` are left out.
+        Does not over-write unless `force` is set to `True`, in which case the yielded callable writes nothing.
+
+        Parameters
+        ----------
+        schema : dict[str, str]
+            | column names and their types, one of `"string"`, `"category"` (dictionary encoded strings), `"int64"` or `"float64"`
+        force : bool, default=`False`
+            | whether to force over-writing the file
+
+        Yields
+        ------
+        Callable[[Iterable[dict[str, Any]]], None]
+            | a callable object writing the given dictionaries of column name and value pairs to the end of the file
+
+        Raises
+        ------
+        RuntimeError
+            | when `pyarrow` is not installed
+        ValueError
+            | when `schema` holds an unknown column type
+        """
+
+        pa, pq = self._import_pyarrow()
+
+        arrow_types: dict[str, Any] = {
+            "string": pa.string(),
+            "category": pa.dictionary(pa.int32(), pa.string()),
+            "int64": pa.int64(),
+            "float64": pa.float64()
+        }
+        _check_schema(schema)
+
+        if self.exists() and not force:
+            yield lambda data: None
+            return
+
+        arrow_schema: Any = pa.schema([(column, arrow_types[column_type]) for column, column_type in schema.items()])
+        try:
+            with pq.ParquetWriter(self._path, arrow_schema) as parquet_writer:
+                def write_data(data: Iterable[dict[str, Any]]) -> None:
+                    rows: list[dict[str, Any]] = list(data)
+                    if not rows:
+                        return
+
+                    parquet_writer.write_table(pa.table({
+                        column: pa.array([_convert_value(row.get(column), column_type) for row in rows], type=arrow_types[column_type])
+                        for column, column_type in schema.items()
+                    }, schema=arrow_schema))
+
+                yield write_data
+        except BaseException:
+            # an unfinished file has no footer and cannot be read at all
+            self.remove()
+            raise
+
+
+    def read_table(self, columns: list[str] | None=None) -> Any:
+        """
+        Reads the Parquet file, only loading the given columns.
+
+        Parameters
+        ----------
+        columns : list[str], optional
+            | names of the columns to read, all of them if not given
+
+        Returns
+        -------
+        pyarrow.Table
+            | the (selected columns of the) file, `.to_pandas()` turns it into a DataFrame
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file or `pyarrow` is not installed
+        """
+
+        pa, pq = self._import_pyarrow()
+
+        if not self.exists():
+            raise RuntimeError("File cannot be read, as it does not exist")
+
+        return pq.read_table(self._path, columns=columns)
+
+
+class SQLiteFile(File):
+    def __init__(self, dir: Directory, filename: str) -> None:
+        """"
+        SQLiteFile initialiser, for a database that can be queried without loading all of it.
+
+        Parameters
+        ----------
+        dir : Directory
+            | a Directory type representing where the file will be stored
+        filename : str
+            | name of the file without '.sqlite'
+        """
+
+        super().__init__(dir, filename + ".sqlite")
+
+
+    def __str__(self) -> str:
+        return f"<SQLiteFile path={self._path}>"
+
+
+    @contextmanager
+    def stream_records(
+        self,
+        table: str,
+        schema: dict[str, str],
+        key: str,
+        indexes: Iterable[str]=()
+    ) -> Iterator[Callable[[Iterable[dict[str, Any]]], None]]: # break arguments into seperate lines to avoid line being to long
+        """
+        Opens the database for upserting dictionaries into `table` in batches (one transaction per batch), as they become available.
+        The tables and their indexes are created if they do not exist yet, otherwise rows with an existing `key` are updated in place.
+        Every column has a fixed type, fields not in `schema` are left out and dictionaries without `key` are skipped.
+        The data is normalized: every `"category"` column gets a lookup table (`table_column` with `id` and `value`),
+        the rows are stored in `table_data` with a foreign key (`column_id`) in place of every such column,
+        and `table` is a view joining them back into the flat shape, so it can be queried as one table.
+
+        Parameters
+        ----------
+        table : str
+            | name of the view, also the prefix of the tables behind it
+        schema : dict[str, str]
+            | column names and their types, one of `"string"`, `"category"`, `"int64"` or `"float64"` (see `ParquetFile`)
+        key : str
+            | column uniquely identifying a row, has to be in `schema` and cannot be a `"category"`
+        indexes : Iterable[str], default=`()`
+            | columns to create indexes on (the foreign key for `"category"` columns), `key` is always indexed
+
+        Yields
+        ------
+        Callable[[Iterable[dict[str, Any]]], None]
+            | a callable object upserting the given dictionaries of column name and value pairs
+
+        Raises
+        ------
+        ValueError
+            | when `schema` holds an unknown column type or does not hold `key`, or when `key` is a `"category"`
+        """
+
+        _check_schema(schema)
+        if not key in schema.keys():
+            raise ValueError(f"Key column '{key}' is not part of the schema")
+        if schema[key] == "category":
+            raise ValueError(f"Key column '{key}' cannot be a category")
+
+        sqlite_types: dict[str, str] = {
+            "string": "TEXT",
+            "category": "INTEGER",
+            "int64": "INTEGER",
+            "float64": "REAL"
+        }
+        columns: list[str] = list(schema.keys())
+        categories: list[str] = [column for column, column_type in schema.items() if column_type == "category"]
+        # name of every column in the data table
+        stored: dict[str, str] = {column: column + "_id" if column in categories else column for column in columns}
+        quoted: list[str] = [f'"{stored[column]}"' for column in columns]
+        data_table: str = f"{table}_data"
+
+        upsert: str = (
+            f'INSERT INTO "{data_table}" ({", ".join(quoted)}) VALUES ({", ".join("?"*len(columns))}) '
+            f'ON CONFLICT("{key}") DO UPDATE SET {", ".join(f"{column} = excluded.{column}" for column in quoted)}'
+        )
+        # ids of the category values seen so far, so every value is only looked up once
+        category_ids: dict[str, dict[str, int]] = {column: {} for column in categories}
+
+        connection: sqlite3.Connection = sqlite3.connect(self._path)
+        try:
+            def get_category_id(column: str, value: Any) -> int | None:
+                if value is None:
+                    return None
+
+                ids: dict[str, int] = category_ids[column]
+                if not value in ids.keys():
+                    connection.execute(f'INSERT OR IGNORE INTO "{table}_{column}" (value) VALUES (?)', (value,))
+                    ids[value] = connection.execute(f'SELECT id FROM "{table}_{column}" WHERE value = ?', (value,)).fetchone()[0]
+
+                return ids[value]
+
+            def to_row(row_dict: dict[str, Any]) -> list[Any]:
+                values: list[Any] = [_convert_value(row_dict.get(column), schema[column]) for column in columns]
+                return [get_category_id(column, value) if column in categories else value for column, value in zip(columns, values)]
+
+            def write_data(data: Iterable[dict[str, Any]]) -> None:
+                with connection:
+                    connection.executemany(upsert, (
+                        to_row(row_dict)
+                        for row_dict in data if _convert_value(row_dict.get(key), schema[key]) is not None
+                    ))
+
+            with connection:
+                column: str
+                for column in categories:
+                    connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}_{column}" (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)')
+
+                column_definitions: str = ", ".join(
+                    f'"{stored[column]}" {sqlite_types[column_type]}'
+                    + (" PRIMARY KEY" if column == key else "")
+                    + (f' REFERENCES "{table}_{column}" (id)' if column in categories else "")
+                    for column, column_type in schema.items()
+                )
+                connection.execute(f'CREATE TABLE IF NOT EXISTS "{data_table}" ({column_definitions})')
+
+                for column in indexes:
+                    if column != key:
+                        connection.execute(f'CREATE INDEX IF NOT EXISTS "{data_table}_{column}" ON "{data_table}" ("{stored[column]}")')
+
+                selected: str = ", ".join(f'"{column}".value AS "{column}"' if column in categories else f'data."{column}"' for column in columns)
+                joins: str = " ".join(f'LEFT JOIN "{table}_{column}" AS "{column}" ON "{column}".id = data."{stored[column]}"' for column in categories)
+                connection.execute(f'CREATE VIEW IF NOT EXISTS "{table}" AS SELECT {selected} FROM "{data_table}" AS data {joins}')
+
+            yield write_data
+        finally:
+            connection.close()
+
+
+    def query(self, sql: str, parameters: Iterable[Any]=()) -> list[tuple[Any, ...]]:
+        """
+        Runs a query on the database.
+
+        Parameters
+        ----------
+        sql : str
+            | the SQL query, with `?` in place of the parameters
+        parameters : Iterable[Any], default=`()`
+            | values to fill in for the `?` placeholders
+
+        Returns
+        -------
+        list[tuple[Any, ...]]
+            | all the resulting rows
+
+        Raises
+        ------
+        RuntimeError
+            | when trying to read a non-existent file
+        """
+
+        if not self.exists():
+            raise RuntimeError("File cannot be read, as it does not exist")
+
+        connection: sqlite3.Connection = sqlite3.connect(self._path)
+        try:
+            return connection.execute(sql, tuple(parameters)).fetchall()
+        finally:
+            connection.close()
@@ -0,0 +1,171 @@
+from typing import Any, Iterable, Iterator
+
+
+class Missing:
+    """
+    Type of the `MISSING` sentinel, marking a field a record does not have.
+    There is only ever one instance, so it can (and should) be checked with `is`.
+    """
+
+    _instance: "Missing | None" = None
+
+    def __new__(cls) -> "Missing": # have to use "Missing" since cannot use the class itself inside its definition
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+
+        return cls._instance
+
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+    def __bool__(self) -> bool:
+        return False
+
+
+    def __reduce__(self) -> str:
+        # unpickle as the module level `MISSING`, so `is` checks keep working across processes
+        return "MISSING"
+
+
+# marks fields a record does not have (instead of leaving the key out, like one dict per record would)
+MISSING: Missing = Missing()
+
+
+class ColumnTable:
+    """
+    Compact storage for many records sharing (mostly) the same fields.
+    Values are kept in one list per field instead of one dict per record, with `MISSING` filling in the fields a record does not have.
+    """
+
+    columns: dict[str, list[Any]]
+    _length: int
+
+    def __init__(self) -> None:
+        """
+        ColumnTable initialiser, the table starts out empty.
+        """
+
+        self.columns = {}
+        self._length = 0
+
+
+    def __str__(self) -> str:
+        return f"<ColumnTable variables={self.variables} length={self._length}>"
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    @property
+    def variables(self) -> list[str]:
+        """
+        Names of all the fields seen so far, in the order they were first added.
+        """
+
+        return list(self.columns.keys())
+
+
+    def _get_column(self, variable: str) -> list[Any]:
+        # records added before the field was seen do not have it
+        if not variable in self.columns:
+            self.columns[variable] = [MISSING]*self._length
+
+        return self.columns[variable]
+
+
+    def add_rows(self, variables: list[str], rows: Iterable[list[Any]], empty: Any="") -> None:
+        """
+        Appends rows of values to the table.
+        Fields the rows do not have (or that equal `empty`) are stored as `MISSING`.
+
+        Parameters
+        ----------
+        variables : list[str]
+            | names of the fields, in the order their values appear in every row
+        rows : Iterable[list[Any]]
+            | an iterable containing the rows to be added, represented as lists of values
+        empty : Any, default=`""`
+            | value to treat as missing
+        """
+
+        page_columns: list[list[Any]] = [self._get_column(variable) for variable in variables]
+        added: int = 0
+
+        row: list[Any]
+        for row in rows:
+            column: list[Any]
+            value: Any
+            for column, value in zip(page_columns, row):
+                column.append(MISSING if value == empty else value)
+            # keep the columns aligned when a row is shorter than the header
+            for column in page_columns[len(row):]:
+                column.append(MISSING)
+            added += 1
+
+        self._pad(added)
+
+
+    def extend(self, other: "ColumnTable") -> None:
+        """
+        Appends all the records of another table to the end of this one.
+
+        Parameters
+        ----------
+        other : ColumnTable
+            | table whose records are added
+        """
+
+        variable: str
+        values: list[Any]
+        for variable, values in other.columns.items():
+            self._get_column(variable).extend(values)
+
+        self._pad(len(other))
+
+
+    def _pad(self, added: int) -> None:
+        # every column has to stay as long as the table, so fill in the fields the new records did not have
+        self._length += added
+
+        column: list[Any]
+        for column in self.columns.values():
+            if len(column) < self._length:
+                column.extend([MISSING]*(self._length - len(column)))
+
+
+    def get_record(self, index: int) -> dict[str, Any]:
+        """
+        Builds the record at the given position.
+
+        Parameters
+        ----------
+        index : int
+            | position of the record in the table
+
+        Returns
+        -------
+        dict[str, Any]
+            | dictionary of field names and values, leaving out the missing fields
+        """
+
+        return {variable: column[index] for variable, column in self.columns.items() if column[index] is not MISSING}
+
+
+    def iter_records(self) -> Iterator[dict[str, Any]]:
+        """
+        Iterates over all the records in order, building only one dictionary at a time.
+
+        Yields
+        ------
+        dict[str, Any]
+            | dictionary of field names and values, leaving out the missing fields
+        """
+
+        variables: list[str] = self.variables
+
+        values: tuple[Any, ...]
+        for values in zip(*self.columns.values()):
+            yield {variable: value for variable, value in zip(variables, values) if value is not MISSING}
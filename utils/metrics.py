@@ -0,0 +1,201 @@
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from .datafiles import NDJSONFile
+
+
+class Metrics:
+    events: list[dict[str, Any]]
+    started: float
+    counted_fields: set[str]
+
+    _lock: threading.Lock
+
+    def __init__(self, counted_fields: set[str]={"status"}) -> None:
+        """
+        Metrics initialiser.
+        Collects one event (a flat dictionary of measurements) per thing that happened, e.g. a page being downloaded or parsed.
+        Events can be recorded from any thread and are kept in the order they were recorded.
+
+        Parameters
+        ----------
+        counted_fields : set[str], default=`{"status"}`
+            | fields holding labels rather than amounts (e.g. HTTP status codes), summarised by how often every value appears
+        """
+
+        self.events = []
+        self.started = time.time()
+        self.counted_fields = counted_fields
+
+        self._lock = threading.Lock()
+
+
+    def __str__(self) -> str:
+        return f"<Metrics events={len(self.events)}>"
+
+
+    def record(self, kind: str, **fields: Any) -> dict[str, Any]:
+        """
+        Records an event.
+
+        Parameters
+        ----------
+        kind : str
+            | what kind of event it is (e.g. `"download"`), events of the same kind are summarised together
+        **fields : Any
+            | measurements of the event, only JSON compatible values
+
+        Returns
+        -------
+        dict[str, Any]
+            | the recorded event, with `kind` and the time since the start of the run (`at`) added
+        """
+
+        event: dict[str, Any] = { "kind": kind, "at": round(time.time() - self.started, 6) } | fields
+        with self._lock:
+            self.events.append(event)
+
+        return event
+
+
+    @contextmanager
+    def timer(self, kind: str, **fields: Any) -> Iterator[dict[str, Any]]:
+        """
+        Records an event with how long the `with` block took (`seconds`), even if it raised.
+
+        Parameters
+        ----------
+        kind : str
+            | what kind of event it is (see `record`)
+        **fields : Any
+            | measurements known before the block runs
+
+        Yields
+        ------
+        dict[str, Any]
+            | the fields of the event, more can be added to it inside the block
+        """
+
+        start_time: float = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(kind, seconds=time.perf_counter() - start_time, **fields)
+
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """
+        Summarises the events of every kind.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            | for every kind the number of events (`count`), the total of every numeric field, the number of events every flag was set in,
+            | the longest `seconds` (`max_seconds`) and how often every value of a counted field appeared (`field_counts`)
+        """
+
+        with self._lock:
+            events: list[dict[str, Any]] = list(self.events)
+
+        summary: dict[str, dict[str, Any]] = {}
+
+        event: dict[str, Any]
+        for event in events:
+            totals: dict[str, Any] = summary.setdefault(event["kind"], { "count": 0 })
+            totals["count"] += 1
+
+            field: str
+            value: Any
+            for field, value in event.items():
+                if field in self.counted_fields:
+                    counts: dict[str, int] = totals.setdefault(field + "_counts", {})
+                    counts[str(value)] = counts.get(str(value), 0) + 1
+                    continue
+
+                # `at` is a point in time, not an amount (flags are fine, they add up to how often they were set)
+                if field == "at" or not isinstance(value, (int, float)):
+                    continue
+
+                totals[field] = totals.get(field, 0) + value
+                if field == "seconds":
+                    totals["max_seconds"] = max(totals.get("max_seconds", 0.0), value)
+
+        return summary
+
+
+    def report(self) -> str:
+        """
+        Formats the summary into a human readable report, one line per kind of event.
+        Kinds with bytes or rows also get their throughput over the time they took.
+
+        Returns
+        -------
+        str
+            | the report
+        """
+
+        lines: list[str] = [f"Metrics of the run ({round(time.time() - self.started, 3)}s):"]
+
+        kind: str
+        totals: dict[str, Any]
+        for kind, totals in self.summary().items():
+            parts: list[str] = [f"{totals['count']}x"]
+            seconds: float = totals.get("seconds", 0.0)
+            if "seconds" in totals:
+                parts.append(f"{round(seconds, 3)}s total, {round(seconds/totals['count'], 5)}s mean, {round(totals['max_seconds'], 5)}s max")
+            if seconds > 0 and totals.get("bytes"):
+                parts.append(f"{round(totals['bytes']/1024/1024/seconds, 3)} MB/s")
+            if seconds > 0 and totals.get("rows"):
+                parts.append(f"{round(totals['rows']/seconds, 1)} rows/s")
+
+            field: str
+            value: Any
+            for field, value in totals.items():
+                if field in ["count", "seconds", "max_seconds"]:
+                    continue
+                parts.append(f"{field}={value}" if isinstance(value, dict) else f"{field}={round(value, 3)}")
+
+            lines.append(f"'{kind}': " + ", ".join(parts))
+
+        return "\n".join(lines)
+
+
+    def write_ndjson(self, ndjson_file: NDJSONFile) -> None:
+        """
+        Over-writes the given file with every event, one per line, followed by the summary as an event of kind `"summary"`.
+
+        Parameters
+        ----------
+        ndjson_file : NDJSONFile
+            | file to write the events to
+        """
+
+        with self._lock:
+            events: list[dict[str, Any]] = list(self.events)
+
+        ndjson_file.write_ndjson(events + [{ "kind": "summary", "at": round(time.time() - self.started, 6), "kinds": self.summary() }], force=True)
+
+
+def peak_memory() -> int | None:
+    """
+    Gets the most memory the process has used at once so far (its peak resident set size).
+
+    Returns
+    -------
+    int | None
+        | peak memory in bytes or `None` if the platform does not report it (e.g. Windows)
+    """
+
+    # not available everywhere, so only import when asked
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss*1024
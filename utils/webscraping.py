@@ -1,21 +1,579 @@
 import requests as req
 import bs4 as bs
 
+import asyncio
+import collections
 import concurrent.futures as cf
+import functools
+import hashlib
+import queue
+import random
+import re
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
+
+from .datafiles import Directory, HTMLCache, HTMLFile
+
+
+# size of the chunks in which pages are streamed to disk (bounds the memory used per download)
+CHUNK_SIZE: int = 64*1024
+# seconds to wait for the website to connect or send the next chunk before giving up on the attempt
+TIMEOUT: float = 60.0
+
+
+class RetryPolicy:
+    attempts: int
+    backoff: float
+    max_backoff: float
+    jitter: float
+    retry_statuses: set[int]
+
+    def __init__(
+        self,
+        attempts: int=3,
+        backoff: float=1.0,
+        max_backoff: float=60.0,
+        jitter: float=0.5,
+        retry_statuses: set[int]={429, 500, 502, 503, 504}
+    ) -> None: # break arguments into seperate lines to avoid line being to long
+        """
+        RetryPolicy initialiser.
+        Describes how many times and how long apart failed requests are retried (exponential backoff with random jitter).
+
+        Parameters
+        ----------
+        attempts : int, default=`3`
+            | total number of attempts per request, including the first one
+        backoff : float, default=`1.0`
+            | seconds to wait before the first retry, doubled for every following retry
+        max_backoff : float, default=`60.0`
+            | upper limit for the wait between attempts in seconds
+        jitter : float, default=`0.5`
+            | fraction of the wait that is randomised, so retrying threads do not all come back at once
+        retry_statuses : set[int], default=`{429, 500, 502, 503, 504}`
+            | HTTP status codes worth retrying (connection errors and timeouts are always retried)
+        """
+
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+
+
+    def __str__(self) -> str:
+        return f"<RetryPolicy attempts={self.attempts} backoff={self.backoff}>"
+
+
+    def should_retry(self, attempt: int, status: int | None) -> bool:
+        """
+        Checks if a failed attempt should be retried.
+
+        Parameters
+        ----------
+        attempt : int
+            | number of the attempt that failed, starting with `1`
+        status : int | None
+            | HTTP status code of the failed attempt or `None` if no response was received
+
+        Returns
+        -------
+        bool
+            | `True` if another attempt should be made otherwise `False`
+        """
+
+        return attempt < self.attempts and (status is None or status in self.retry_statuses)
+
+
+    def delay(self, attempt: int) -> float:
+        """
+        Calculates how long to wait after the given failed attempt.
+
+        Parameters
+        ----------
+        attempt : int
+            | number of the attempt that failed, starting with `1`
+
+        Returns
+        -------
+        float
+            | seconds to wait before the next attempt
+        """
+
+        delay: float = min(self.backoff*2**(attempt - 1), self.max_backoff)
+        return delay*(1 - self.jitter*random.random())
+
+
+class RateLimiter:
+    rate: float
+    capacity: float
+
+    _tokens: float
+    _updated: float
+    _lock: threading.Lock
+
+    def __init__(self, rate: float, capacity: float | None=None) -> None:
+        """
+        RateLimiter initialiser.
+        A token bucket shared between all the workers, allowing on average `rate` requests per second with bursts of up to `capacity` requests.
+
+        Parameters
+        ----------
+        rate : float
+            | requests allowed per second (non-positive values disable limiting)
+        capacity : float, optional
+            | size of the bucket, defaults to `rate` (one second worth of requests)
+        """
+
+        self.rate = rate
+        self.capacity = max(capacity if capacity is not None else rate, 1.0)
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def __str__(self) -> str:
+        return f"<RateLimiter rate={self.rate}/s capacity={self.capacity}>"
+
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket, going into debt if there is none.
+
+        Returns
+        -------
+        float
+            | seconds the caller has to wait before making its request
+        """
+
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated)*self.rate)
+            self._updated = now
+
+            self._tokens -= 1
+            # negative tokens are requests already promised to earlier callers
+            return max(-self._tokens/self.rate, 0.0)
+
+
+    def acquire(self) -> None:
+        """
+        Blocks until the caller is allowed to make a request.
+        """
+
+        wait: float = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+    async def acquire_async(self) -> None:
+        """
+        Asynchronous version of `acquire`, which does not block the event loop.
+        """
+
+        wait: float = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class ConcurrencyController:
+    minimum: int
+    maximum: int
+    limit: float
+    increase: float
+    decrease: float
+    slowdown: float
+
+    active: int
+    baseline: float | None
+    samples: collections.deque[float]
+    _last_decrease: float
+    _condition: threading.Condition
+
+    def __init__(
+        self,
+        initial: int=8,
+        minimum: int=1,
+        maximum: int=32,
+        increase: float=1.0,
+        decrease: float=0.5,
+        slowdown: float=2.0,
+        window: int=20
+    ) -> None: # break arguments into seperate lines to avoid line being to long
+        """
+        ConcurrencyController initialiser.
+        Limits how many downloads run at once and adapts the limit to how the website copes (additive increase, multiplicative decrease).
+        Every healthy download made while the limit was reached raises it by `increase`,
+        every throttled (429), failed (5xx, timeout) or retried download and every slow one multiplies it by `decrease`.
+        A download is slow when its response takes `slowdown` times longer to start arriving (time to first byte, so pages of any size compare)
+        than the baseline, the lower quartile of the last `window` downloads, so a single unusually fast response does not make every other one look slow.
+
+        Parameters
+        ----------
+        initial : int, default=`8`
+            | number of downloads allowed at once to start with
+        minimum : int, default=`1`
+            | lowest the limit can go
+        maximum : int, default=`32`
+            | highest the limit can go (also the number of threads or connections that have to be available)
+        increase : float, default=`1.0`
+            | how much to raise the limit by after a healthy download
+        decrease : float, default=`0.5`
+            | factor to multiply the limit with after a slow or failed download
+        slowdown : float, default=`2.0`
+            | how many times slower than the baseline a download has to be to count as a slowdown
+        window : int, default=`20`
+            | number of the most recent downloads the baseline is taken from
+        """
+
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.increase = increase
+        self.decrease = decrease
+        self.slowdown = slowdown
+
+        self.active = 0
+        self.baseline = None
+        self.samples = collections.deque(maxlen=max(window, 1))
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+
+    def __str__(self) -> str:
+        return f"<ConcurrencyController limit={self.get_limit()} range={self.minimum}-{self.maximum}>"
+
+
+    def get_limit(self) -> int:
+        """
+        Gets the number of downloads currently allowed at once.
+
+        Returns
+        -------
+        int
+            | the current limit
+        """
+
+        return max(int(self.limit), self.minimum)
+
+
+    def try_acquire(self) -> float | None:
+        """
+        Starts a download if the limit allows it, without waiting.
+
+        Returns
+        -------
+        float | None
+            | time the download started (to be passed to `release`) or `None` if the limit is reached
+        """
+
+        with self._condition:
+            if self.active >= self.get_limit():
+                return None
+
+            self.active += 1
+            return time.monotonic()
+
+
+    def acquire(self) -> float:
+        """
+        Blocks until a download can be started and starts it.
+
+        Returns
+        -------
+        float
+            | time the download started (to be passed to `release`)
+        """
+
+        with self._condition:
+            self._condition.wait_for(lambda: self.active < self.get_limit())
+
+            self.active += 1
+            return time.monotonic()
+
+
+    def release(self, started: float, latency: float, status: int | None, attempts: int, failed: bool=False) -> None:
+        """
+        Ends a download started with `acquire` or `try_acquire` and adapts the limit to how it went.
+
+        Parameters
+        ----------
+        started : float
+            | time the download started, as returned by `acquire`
+        latency : float
+            | seconds until the response of the (last attempt of the) download started arriving (time to first byte)
+        status : int | None
+            | HTTP status code of the last response or `None` if there was none
+        attempts : int
+            | number of attempts made, `0` if the page was never requested (e.g. already saved)
+        failed : bool, default=`False`
+            | whether the download failed after all the attempts
+        """
+
+        with self._condition:
+            # the limit is only reached if every other download was running alongside this one
+            saturated: bool = self.active >= self.get_limit()
+            self.active -= 1
+
+            if attempts > 0:
+                if self._is_congested(latency, status, attempts, failed):
+                    # downloads started before the last decrease ran with the old limit, so they must not decrease it again
+                    if started >= self._last_decrease:
+                        self.limit = max(self.limit*self.decrease, float(self.minimum))
+                        self._last_decrease = time.monotonic()
+                elif saturated:
+                    self.limit = min(self.limit + self.increase, float(self.maximum))
+
+            self._condition.notify_all()
+
+
+    def _is_congested(self, latency: float, status: int | None, attempts: int, failed: bool) -> bool:
+        # the website saying it is overloaded, or not answering at all
+        if status == 429 or (status is not None and status >= 500) or (failed and status is None) or attempts > 1:
+            return True
+
+        # only full pages are comparable, unchanged pages (304) are answered without sending them
+        if status != 200:
+            return False
+
+        self.samples.append(latency)
+        # too few downloads to tell what is usual for the website yet
+        if len(self.samples) < 4:
+            return False
+
+        self.baseline = sorted(self.samples)[len(self.samples)//4]
+        return latency > self.baseline*self.slowdown
+
+
+class DownloadProgress:
+    total: int
+    concurrency: int
+    done: int
+    failed: int
+    active: int
+    downloaded: int
+    started: float
+    finished: float | None
+
+    _lock: threading.Lock
+
+    def __init__(self, total: int, concurrency: int) -> None:
+        """
+        DownloadProgress initialiser.
+        Keeps count of the pages of one round of downloads as they start and finish, so it can be polled from any thread while they run.
+
+        Parameters
+        ----------
+        total : int
+            | number of pages to download
+        concurrency : int
+            | maximum number of pages downloaded at the same time
+        """
+
+        self.total = total
+        self.concurrency = concurrency
+        self.done = 0
+        self.failed = 0
+        self.active = 0
+        self.downloaded = 0
+        self.started = time.monotonic()
+        # nothing to wait for when there are no pages
+        self.finished = None if total > 0 else self.started
+
+        self._lock = threading.Lock()
+
+
+    def __str__(self) -> str:
+        return f"<DownloadProgress {self.format()}>"
+
+
+    def start_page(self) -> None:
+        """
+        Marks a page as being downloaded.
+        """
+
+        with self._lock:
+            self.active += 1
+
+
+    def finish_page(self, downloaded: int, failed: bool=False) -> None:
+        """
+        Marks a page as done, whether it was downloaded, skipped or failed.
+
+        Parameters
+        ----------
+        downloaded : int
+            | number of bytes received for the page
+        failed : bool, default=`False`
+            | whether the page failed to download
+        """
+
+        with self._lock:
+            # skipped pages are done without ever being started
+            self.active = max(self.active - 1, 0)
+            self.done += 1
+            self.failed += failed
+            self.downloaded += downloaded
+            # stop the clock, so the speed does not keep dropping while nothing is downloading anymore
+            if self.done >= self.total:
+                self.finished = time.monotonic()
+
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Gets the progress so far, all from the same moment.
+
+        Returns
+        -------
+        dict[str, Any]
+            | pages `done` out of `total` (`failed` included), pages `active` right now out of `concurrency`,
+            | bytes `downloaded`, `elapsed` seconds, `rate` in bytes per second and `eta` in seconds (`None` until a page is done)
+        """
+
+        with self._lock:
+            elapsed: float = (time.monotonic() if self.finished is None else self.finished) - self.started
+            # the pages left are assumed to take as long as the ones done so far
+            eta: float | None = (self.total - self.done)*elapsed/self.done if self.done > 0 else None
+
+            return {
+                "done": self.done,
+                "total": self.total,
+                "failed": self.failed,
+                "active": self.active,
+                "concurrency": self.concurrency,
+                "downloaded": self.downloaded,
+                "elapsed": elapsed,
+                "rate": self.downloaded/elapsed if elapsed > 0 else 0.0,
+                "eta": eta
+            }
+
+
+    def format(self) -> str:
+        """
+        Formats the progress so far into one line.
+
+        Returns
+        -------
+        str
+            | pages done, failed pages, download speed, pages in flight and the estimated time left
+        """
+
+        progress: dict[str, Any] = self.snapshot()
+        eta: str = "?" if progress["eta"] is None else f"{round(progress['eta'], 1)}s"
+
+        return (
+            f"{progress['done']}/{progress['total']} pages ({progress['failed']} failed), "
+            f"{round(progress['rate']/1024/1024, 3)} MB/s, {progress['active']}/{progress['concurrency']} in flight, ETA {eta}"
+        )
+
+
+class SessionPool:
+    size: int
+    headers: dict[str, str]
+
+    _sessions: queue.Queue[req.Session]
+
+    def __init__(self, size: int, headers: dict[str, str]={}) -> None:
+        """
+        SessionPool initialiser.
+        Creates `size` keep-alive sessions, each with a pooled adapter, so connections get reused between requests.
+
+        Parameters
+        ----------
+        size : int
+            | number of sessions in the pool (should match the number of threads using it)
+        headers : dict[str, str], default=`{}`
+            | headers to be supplied with every request made through the pool
+        """
+
+        self.size = max(size, 1)
+        self.headers = headers
+
+        self._sessions = queue.Queue(maxsize=self.size)
+
+        i: int
+        for i in range(self.size):
+            self._sessions.put(self._make_session())
+
+
+    def __str__(self) -> str:
+        return f"<SessionPool size={self.size}>"
+
+
+    def _make_session(self) -> req.Session:
+        session: req.Session = req.Session()
+        session.headers.update(self.headers)
+
+        # each thread only ever uses one session at a time, but keep a few spare connections for redirects
+        adapter: req.adapters.HTTPAdapter = req.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+
+    @contextmanager
+    def borrow(self) -> Iterator[req.Session]:
+        """
+        Borrows a session from the pool and returns it once done.
+        Blocks until a session is available, which makes it safe to share the pool between threads.
+
+        Yields
+        ------
+        requests.Session
+            | a session not used by anyone else until it is returned
+        """
+
+        session: req.Session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
 
-from io import TextIOWrapper
+    def close(self) -> None:
+        """
+        Closes all the sessions currently in the pool (and with them their open connections).
+        """
 
-from .datafiles import Directory, HTMLFile
+        while not self._sessions.empty():
+            self._sessions.get_nowait().close()
 
 
 class PageScraper:
     url: str
     headers: dict[str, str]
     html_file: HTMLFile | None
+    session_pool: SessionPool | None
+    retry_policy: RetryPolicy
+    rate_limiter: RateLimiter | None
+    modified: bool | None
+
+    # what happened during the last save, for reporting and tuning the downloads
+    status: int | None
+    downloaded: int
+    latency: float
+    first_byte: float
+    attempts: int
 
     parser: bs.BeautifulSoup | None
 
-    def __init__(self, url: str, headers: dict[str, str]={}, html_file: HTMLFile | None=None) -> None:
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str]={},
+        html_file: HTMLFile | None=None,
+        session_pool: SessionPool | None=None,
+        retry_policy: RetryPolicy | None=None,
+        rate_limiter: RateLimiter | None=None
+    ) -> None: # break arguments into seperate lines to avoid line being to long
         """
         PageScraper initialiser.
 
@@ -27,11 +585,27 @@ class PageScraper:
             | headers to be supplied with the http request
         html_file : HTMLFile, optional
             | an HTMLFile object representing the file to save to
+        session_pool : SessionPool, optional
+            | a SessionPool to borrow keep-alive sessions from (if not supplied a new session is used for every request)
+        retry_policy : RetryPolicy, optional
+            | how to retry failed downloads when saving (defaults to `RetryPolicy()`)
+        rate_limiter : RateLimiter, optional
+            | a RateLimiter every download attempt has to wait for, usually shared between scrapers
         """
 
         self.url = url
         self.headers = headers
         self.html_file = html_file
+        self.session_pool = session_pool
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.modified = None
+
+        self.status = None
+        self.downloaded = 0
+        self.latency = 0.0
+        self.first_byte = 0.0
+        self.attempts = 0
 
         self.parser = None
 
@@ -80,14 +654,169 @@ class PageScraper:
             | HTML source code
         """
 
-        # adding headers requires Session
-        session = req.Session()
-        return req.get(self.url, headers=self.headers).text
+        # same request as every download makes, only read as a whole
+        with self.open_html() as response:
+            return response.text
+
+
+    @contextmanager
+    def open_html(self, extra_headers: dict[str, str]={}) -> Iterator[req.Response]:
+        """
+        Access the website URL without reading the body yet, so it can be streamed.
+        The connection (and the borrowed session, if any) is held until the context is exited.
+
+        Parameters
+        ----------
+        extra_headers : dict[str, str], default=`{}`
+            | headers to add to `headers` just for this request
+
+        Yields
+        ------
+        requests.Response
+            | the streamed response
+        """
+
+        request_headers: dict[str, str] = self.headers | extra_headers
+
+        if self.session_pool is not None:
+            with self.session_pool.borrow() as session:
+                with session.get(self.url, headers=request_headers, stream=True, timeout=TIMEOUT) as response:
+                    yield response
+            return
+
+        with req.Session() as session:
+            with session.get(self.url, headers=request_headers, stream=True, timeout=TIMEOUT) as response:
+                yield response
+
+
+    def search_html(self, pattern: re.Pattern[bytes] | bytes, chunk_size: int=1024) -> re.Match[bytes] | None:
+        """
+        Streams the HTML source code of the website URL until `pattern` is found, then drops the connection.
+        Useful when only a small part near the start of a large page is needed.
+        Error responses are retried like in `save_html`, so an error page is never searched.
+
+        Parameters
+        ----------
+        pattern : re.Pattern[bytes] | bytes
+            | pattern to search for in the undecoded HTML (should not match more than `chunk_size` bytes)
+        chunk_size : int, default=`1024`
+            | size of the chunks read at a time in bytes
+
+        Returns
+        -------
+        re.Match[bytes] | None
+            | the first match or `None` if the whole page was read without finding one
+
+        Raises
+        ------
+        requests.RequestException
+            | when the page still cannot be downloaded after all the retries
+        """
+
+        compiled: re.Pattern[bytes] = re.compile(pattern)
+
+        attempt: int = 1
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                return self._search_response(compiled, chunk_size)
+            except req.RequestException as error:
+                status: int | None = error.response.status_code if error.response is not None else None
+                if not self.retry_policy.should_retry(attempt, status):
+                    raise
+
+            time.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+
+    def _search_response(self, compiled: re.Pattern[bytes], chunk_size: int) -> re.Match[bytes] | None:
+        buffer: bytes = b""
+
+        with self.open_html() as response:
+            # an error page does not have what we are looking for, so it has to be retried instead of searched
+            response.raise_for_status()
+
+            chunk: bytes
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                buffer += chunk
+
+                match: re.Match[bytes] | None = compiled.search(buffer)
+                if match is not None:
+                    return match
+
+                # keep the last chunk in case the match is split between two chunks
+                buffer = buffer[-chunk_size:]
+
+        return None
+
+
+    def conditional_headers(self, html_file: HTMLFile) -> dict[str, str]:
+        """
+        Builds the `If-None-Match`/`If-Modified-Since` headers from the metadata of a previously saved page.
+
+        Parameters
+        ----------
+        html_file : HTMLFile
+            | HTMLFile object of the previously saved page
+
+        Returns
+        -------
+        dict[str, str]
+            | the conditional headers (empty if the page or its metadata does not exist or belongs to another URL)
+        """
+
+        if not html_file.exists():
+            return {}
+
+        meta: dict[str, Any] | None = html_file.read_meta()
+        if meta is None or meta.get("url") != self.url:
+            return {}
+
+        conditional: dict[str, str] = {}
+        if meta.get("etag"):
+            conditional["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            conditional["If-Modified-Since"] = meta["last_modified"]
+
+        return conditional
+
+
+    def make_meta(self, response_headers: Any, size: int, sha256: str) -> dict[str, Any]:
+        """
+        Builds the metadata saved next to a freshly downloaded page.
+
+        Parameters
+        ----------
+        response_headers : Mapping[str, str]
+            | headers of the response the page was downloaded with
+        size : int
+            | size of the saved page in bytes
+        sha256 : str
+            | hex digest of the saved page
+
+        Returns
+        -------
+        dict[str, Any]
+            | metadata to be written with `HTMLFile.write_meta`
+        """
+
+        return {
+            "url": self.url,
+            "etag": response_headers.get("ETag", ""),
+            "last_modified": response_headers.get("Last-Modified", ""),
+            "fetched": time.time(),
+            "size": size,
+            "sha256": sha256
+        }
 
 
-    def save_html(self, html_file: HTMLFile, force: bool=False) -> None:
+    def save_html(self, html_file: HTMLFile, force: bool=False, revalidate: bool=True) -> None:
         """
         Saves HTML of given website URL to given directory with given filename and properly sets `html_file` instance variable.
+        The page is streamed straight to disk in chunks and kept undecoded until it is parsed.
+        When re-downloading an existing page with `revalidate`, the request is made conditional on the saved ETag/Last-Modified metadata, so an unchanged page is not transferred again.
 
         Parameters
         ----------
@@ -95,15 +824,179 @@ class PageScraper:
             | HTMLFile object of the file to write to
         force : bool, default=`False`
             | whether to force over-writing the provided file (if `False` and file already exists it will also set `html_file` variable to said file)
+        revalidate : bool, default=`True`
+            | whether to only over-write the file if the website reports the page has changed
+        """
+
+        self.html_file = html_file
+        self._reset_stats()
+
+        if self.html_file.exists() and not force:
+            self.modified = False
+            return
+
+        attempt: int = 1
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            # a failed attempt removes the half written page (and its metadata), so only ask for a 304 while there is still a page to keep
+            conditional: dict[str, str] = self.conditional_headers(self.html_file) if revalidate else {}
+
+            self.attempts = attempt
+            start_time: float = time.monotonic()
+            try:
+                self._save_response(conditional, start_time)
+                return
+            except req.RequestException as error:
+                self.status = error.response.status_code if error.response is not None else None
+                if not self.retry_policy.should_retry(attempt, self.status):
+                    raise
+            finally:
+                # only the last attempt counts, waiting for the rate limiter or a retry is not the website being slow
+                self.latency = time.monotonic() - start_time
+
+            time.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+
+    def _save_response(self, conditional: dict[str, str], start_time: float) -> None:
+        # html_file is always set by `save_html` before calling this
+        html_file: HTMLFile = self.html_file # type: ignore
+
+        with self.open_html(conditional) as response:
+            # the body is only read below, so this is how long the website took to start answering
+            self.first_byte = time.monotonic() - start_time
+            self.status = response.status_code
+
+            # page did not change since we last saved it, only remember that we checked
+            if response.status_code == 304:
+                html_file.update_meta(fetched=time.time())
+                self.modified = False
+                return
+
+            # error pages should never end up saved as HTML files
+            response.raise_for_status()
+
+            hasher = hashlib.sha256()
+            size: int = 0
+
+            def hashed_chunks() -> Iterator[bytes]:
+                nonlocal size
+
+                chunk: bytes
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    yield chunk
+
+            html_file.write_html_chunks(hashed_chunks(), force=True)
+            html_file.write_meta(self.make_meta(response.headers, size, hasher.hexdigest()))
+            self.downloaded = size
+            self.modified = True
+
+
+    async def save_html_async(self, html_file: HTMLFile, session: Any, force: bool=False, revalidate: bool=True) -> None:
+        """
+        Asynchronous version of `save_html`, retrying and rate limiting the same way.
+        The HTML is streamed through the given aiohttp session in chunks and written to file in a worker thread, so the event loop never blocks on disk.
+
+        Parameters
+        ----------
+        html_file : HTMLFile
+            | HTMLFile object of the file to write to
+        session : aiohttp.ClientSession
+            | an open aiohttp session to make the request with (typed as Any since aiohttp is an optional dependency)
+        force : bool, default=`False`
+            | whether to force over-writing the provided file (if `False` and file already exists it will also set `html_file` variable to said file)
+        revalidate : bool, default=`True`
+            | whether to only over-write the file if the website reports the page has changed
         """
 
         self.html_file = html_file
+        self._reset_stats()
+
+        if self.html_file.exists() and not force:
+            self.modified = False
+            return
+
+        import aiohttp # only reachable through the async engine, which already made sure aiohttp is installed
+
+        attempt: int = 1
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            # same as in `save_html`, the page from before a failed attempt might not be there anymore
+            conditional: dict[str, str] = await asyncio.to_thread(self.conditional_headers, self.html_file) if revalidate else {}
+
+            self.attempts = attempt
+            start_time: float = time.monotonic()
+            try:
+                await self._save_response_async(session, conditional, start_time)
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                self.status = error.status if isinstance(error, aiohttp.ClientResponseError) else None
+                if not self.retry_policy.should_retry(attempt, self.status):
+                    raise
+            finally:
+                self.latency = time.monotonic() - start_time
+
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+
+    async def _save_response_async(self, session: Any, conditional: dict[str, str], start_time: float) -> None:
+        # html_file is always set by `save_html_async` before calling this
+        html_file: HTMLFile = self.html_file # type: ignore
+
+        async with session.get(self.url, headers=self.headers | conditional) as response:
+            self.first_byte = time.monotonic() - start_time
+            self.status = response.status
+
+            if response.status == 304:
+                await asyncio.to_thread(html_file.update_meta, fetched=time.time())
+                self.modified = False
+                return
+
+            response.raise_for_status()
+
+            hasher = hashlib.sha256()
+            size: int = 0
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            response_chunks: Any = response.content.iter_chunked(CHUNK_SIZE)
 
-        # not the nicest implementation, but will do
-        def custom_writer(file: TextIOWrapper) -> None:
-            file.write(self.get_html())
-        # we override with our custom writer to make sure self.get_html() gets called as late as possible (overriding causes write content to be skipped)
-        self.html_file.write_html("", force=force, writer=custom_writer)
+            async def next_chunk() -> bytes | None:
+                return await anext(response_chunks, None)
+
+            # same as in `_save_response`, but the file is written in a worker thread,
+            # which asks the event loop for one chunk at a time, so only one chunk of the page is ever in memory
+            def hashed_chunks() -> Iterator[bytes]:
+                nonlocal size
+
+                while True:
+                    chunk: bytes | None = asyncio.run_coroutine_threadsafe(next_chunk(), loop).result(timeout=TIMEOUT)
+                    if chunk is None:
+                        return
+
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    yield chunk
+
+            await asyncio.to_thread(html_file.write_html_chunks, hashed_chunks(), force=True)
+
+        await asyncio.to_thread(html_file.write_meta, self.make_meta(response.headers, size, hasher.hexdigest()))
+        self.downloaded = size
+        self.modified = True
+
+
+    def _reset_stats(self) -> None:
+        # a page skipped because it is already saved was never requested
+        self.status = None
+        self.downloaded = 0
+        self.latency = 0.0
+        self.first_byte = 0.0
+        self.attempts = 0
 
 
     def clear_html(self, remove: bool=False) -> None:
@@ -121,14 +1014,18 @@ class PageScraper:
         self.html_file = None
 
 
-    def start_parser(self, parser_type: str="html.parser") -> None:
+    def start_parser(self, parser_type: str="html.parser", parse_only: bs.SoupStrainer | None=None) -> None:
         """
         Starts the parser if html_file variable is set.
+        The HTML is handed to the parser as raw bytes, leaving the decoding to BeautifulSoup.
+        Uncompressed pages are handed over memory-mapped (see `HTMLFile.open_buffer`), but BeautifulSoup still reads them into one bytes object.
 
         Parameters
         ----------
         parser_type : str, default=`"html.parser"`
             | a valid BeautifulSoup parser
+        parse_only : bs.SoupStrainer, optional
+            | only build the tree for the parts of the page matching this SoupStrainer (much faster when only a small part of the page is needed)
 
         Raises
         ------
@@ -140,7 +1037,11 @@ class PageScraper:
         if not self.html_file:
             raise RuntimeError("Cannot start parser without `html_file` being set")
 
-        self.parser = bs.BeautifulSoup(self.html_file.read_html(), parser_type)
+        # the tree does not refer to the buffer once it is built, so the mapping can be closed right away
+        with self.html_file.open_buffer() as buffer:
+            # BeautifulSoup needs the whole page as one object (it would read a file-like one itself), this is the only copy made of it
+            markup: bytes = buffer if isinstance(buffer, bytes) else buffer.read()
+            self.parser = bs.BeautifulSoup(markup, parser_type, parse_only=parse_only)
 
 
     def stop_parser(self) -> None:
@@ -155,9 +1056,24 @@ class MultiScraper:
     pages: dict[str, str]
     headers: dict[str, str]
 
-    scrapers: dict[str, PageScraper]
+    retry_policy: RetryPolicy
+    rate_limiter: RateLimiter | None
+
+    concurrency: ConcurrencyController | None
 
-    def __init__(self, pages: dict[str, str], headers: dict[str, str]={}) -> None:
+    scrapers: dict[str, PageScraper]
+    session_pool: SessionPool | None
+    failures: dict[str, BaseException]
+    progress: DownloadProgress | None
+
+    def __init__(
+        self,
+        pages: dict[str, str],
+        headers: dict[str, str]={},
+        retry_policy: RetryPolicy | None=None,
+        rate_limiter: RateLimiter | None=None,
+        concurrency: ConcurrencyController | None=None
+    ) -> None: # break arguments into seperate lines to avoid line being to long
         """
         MultiScraper initialiser.
 
@@ -167,43 +1083,444 @@ class MultiScraper:
             | a dictionary of custom name and URL pairs (the name will be used to represent the said URL anywhere possible)
         headers : dict[str, str], default=`{}`
             | headers to be supplied with the http requests for all the pages
+        retry_policy : RetryPolicy, optional
+            | how to retry failed downloads (defaults to `RetryPolicy()`)
+        rate_limiter : RateLimiter, optional
+            | a RateLimiter shared by all the scrapers to limit the request rate to the website
+        concurrency : ConcurrencyController, optional
+            | a ConcurrencyController adapting the number of downloads running at once, in place of the fixed number given when saving
         """
 
         self.pages = pages
         self.headers = headers
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
 
         self.scrapers = {}
-
-
-    def init_scrapers(self, save_dir: Directory, threads: int, force: bool=False, clear: bool=False) -> None:
+        self.session_pool = None
+        self.failures = {}
+        self.progress = None
+
+
+    def init_scrapers(
+        self,
+        save_dir: Directory,
+        threads: int,
+        force: bool=False,
+        clear: bool=False,
+        engine: str="threads",
+        revalidate: bool=True,
+        page_names: Iterable[str] | None=None
+    ) -> None: # break arguments into seperate lines to avoid line being to long
         """
         Create and initialise all the scrapes for the provided pages.
         This constructs the required PageScraper objects and saves them into `class.scrapers`, then performs a multithreaded HTML file save.
+        All the PageScraper objects share one SessionPool with a session per thread, so connections to the website get reused.
+        Pages that still fail after all the retries do not stop the others, they are collected in `class.failures` instead.
+        While saving, `class.progress` keeps count of the pages done and in flight, so it can be polled from another thread.
+        With `engine="async"` the pages are instead downloaded from a single thread using asyncio (see `init_scrapers_async`).
+        To start working with pages before all of them are saved, use `iter_scrapers` instead.
+
+        Parameters
+        ----------
+        save_dir : Directory
+            | a Directory object representing where the method will save the pages HTML files (named after the page, or after the URL for an HTMLCache)
+        threads : int
+            | number of threads to be used during the multithreaded saving process (or concurrent requests for the async engine), ignored if `class.concurrency` is set
+        force : bool, default=`False`
+            | whether to force over-writing exsisting files when initiating scrapers
+        clear : bool, default=`False`
+            | whether to clear `save_dir` before initialising (WARNING: THIS DELETES EVERYTHING)
+        engine : str, default=`"threads"`
+            | which download engine to use, either `"threads"` or `"async"`
+        revalidate : bool, default=`True`
+            | whether over-writing existing files should only happen if the website reports the page has changed
+        page_names : Iterable[str], optional
+            | names of the pages to initialise, all the pages by default
+
+        Raises
+        ------
+        ValueError
+            | when an unknown `engine` is supplied or one of `page_names` is not being used
+        """
+
+        name: str
+        for name in self.iter_scrapers(save_dir, threads, force=force, clear=clear, engine=engine, revalidate=revalidate, page_names=page_names):
+            pass
+
+
+    def iter_scrapers(
+        self,
+        save_dir: Directory,
+        threads: int,
+        force: bool=False,
+        clear: bool=False,
+        engine: str="threads",
+        revalidate: bool=True,
+        page_names: Iterable[str] | None=None
+    ) -> Iterator[str]: # break arguments into seperate lines to avoid line being to long
+        """
+        Same as `init_scrapers`, but yields the name of every page as soon as it is done, so the caller can start working on it while the rest are still downloading.
+        Pages are yielded in the order they finish, failed pages included (check them with `is_failed`).
+        The downloads keep going in the background between yields, breaking out of the loop early waits for the ones already started.
 
         Parameters
         ----------
         save_dir : Directory
-            | a Directory object representing where the method will save the pages HTML files
+            | a Directory object representing where the method will save the pages HTML files (named after the page, or after the URL for an HTMLCache)
         threads : int
-            | number of threads to be used during the multithreaded saving process
+            | number of threads to be used during the multithreaded saving process (or concurrent requests for the async engine), ignored if `class.concurrency` is set
         force : bool, default=`False`
             | whether to force over-writing exsisting files when initiating scrapers
         clear : bool, default=`False`
             | whether to clear `save_dir` before initialising (WARNING: THIS DELETES EVERYTHING)
+        engine : str, default=`"threads"`
+            | which download engine to use, either `"threads"` or `"async"`
+        revalidate : bool, default=`True`
+            | whether over-writing existing files should only happen if the website reports the page has changed
+        page_names : Iterable[str], optional
+            | names of the pages to initialise, all the pages by default
+
+        Yields
+        ------
+        str
+            | name of the page that was just saved or failed
+
+        Raises
+        ------
+        ValueError
+            | when an unknown `engine` is supplied or one of `page_names` is not being used
+        RuntimeError
+            | when the async engine is used without `aiohttp` installed
         """
 
+        if not engine in ["threads", "async"]:
+            raise ValueError(f"Unknown download engine '{engine}'")
+
         if clear:
             save_dir.cleardir()
 
+        selected: dict[str, str] = self._select_pages(page_names)
+        self._forget_failures(selected.keys())
+        # a new round of downloads starts counting from zero
+        progress: DownloadProgress = DownloadProgress(len(selected), max(threads, 1) if self.concurrency is None else self.concurrency.get_limit())
+        self.progress = progress
+
+        if engine == "async":
+            yield from self._iter_saved_async(selected, save_dir, threads, force, revalidate, progress)
+        else:
+            yield from self._iter_saved_threads(selected, save_dir, threads, force, revalidate, progress)
+
+
+    def init_scrapers_async(
+        self,
+        save_dir: Directory,
+        concurrency: int,
+        force: bool=False,
+        clear: bool=False,
+        revalidate: bool=True,
+        page_names: Iterable[str] | None=None
+    ) -> None: # break arguments into seperate lines to avoid line being to long
+        """
+        Create and initialise all the scrapes for the provided pages using asyncio instead of threads.
+        Same as `init_scrapers`, but all the requests are made from one event loop with at most `concurrency` of them in flight at once.
+        Requires the optional `aiohttp` library.
+
+        Parameters
+        ----------
+        save_dir : Directory
+            | a Directory object representing where the method will save the pages HTML files (named after the page, or after the URL for an HTMLCache)
+        concurrency : int
+            | maximum number of requests running at the same time
+        force : bool, default=`False`
+            | whether to force over-writing exsisting files when initiating scrapers
+        clear : bool, default=`False`
+            | whether to clear `save_dir` before initialising (WARNING: THIS DELETES EVERYTHING)
+        revalidate : bool, default=`True`
+            | whether over-writing existing files should only happen if the website reports the page has changed
+        page_names : Iterable[str], optional
+            | names of the pages to initialise, all the pages by default
+
+        Raises
+        ------
+        RuntimeError
+            | when `aiohttp` is not installed
+        ValueError
+            | when one of `page_names` is not being used
+        """
+
+        self.init_scrapers(save_dir, concurrency, force=force, clear=clear, engine="async", revalidate=revalidate, page_names=page_names)
+
+
+    def _iter_saved_threads(
+        self,
+        selected: dict[str, str],
+        save_dir: Directory,
+        threads: int,
+        force: bool,
+        revalidate: bool,
+        progress: DownloadProgress
+    ) -> Iterator[str]: # break arguments into seperate lines to avoid line being to long
+        # with an adaptive limit there have to be enough threads for the highest it can go, the controller holds back the extra ones
+        if self.concurrency is not None:
+            threads = self.concurrency.maximum
+
+        # one session per thread is enough, more would just sit idle
+        if self.session_pool is None or self.session_pool.size != threads:
+            self.close()
+            self.session_pool = SessionPool(threads, headers=self.headers)
+
+        futures: dict[cf.Future[None], str] = {}
+
         with cf.ThreadPoolExecutor(max_workers=threads) as executor:
             name: str
             url: str
-            for name, url in self.pages.items():
-                page_scraper: PageScraper = PageScraper(url, headers=self.headers)
+            for name, url in selected.items():
+                page_scraper: PageScraper = self._make_scraper(url)
                 self.scrapers[name] = page_scraper
 
-                html_file = HTMLFile(save_dir, name)
-                executor.submit(page_scraper.save_html, html_file, force=force)
+                html_file: HTMLFile = self._make_html_file(save_dir, name, url)
+                future: cf.Future[None] = executor.submit(self._save_page, progress, page_scraper, html_file, force, revalidate)
+                # counted as soon as it finishes, even while the caller is still busy with an earlier page
+                future.add_done_callback(functools.partial(self._finish_page, progress, page_scraper))
+                futures[future] = name
+
+            for future in cf.as_completed(futures):
+                name = futures[future]
+
+                error: BaseException | None = future.exception()
+                if error is not None:
+                    self.failures[name] = error
+
+                yield name
+
+
+    def _save_page(self, progress: DownloadProgress, page_scraper: PageScraper, html_file: HTMLFile, force: bool, revalidate: bool) -> None:
+        # runs in a worker thread, so the page only counts as in flight once a thread picks it up
+        if self.concurrency is None:
+            progress.start_page()
+            page_scraper.save_html(html_file, force=force, revalidate=revalidate)
+            return
+
+        started: float = self.concurrency.acquire()
+        progress.start_page()
+        failed: bool = True
+        try:
+            page_scraper.save_html(html_file, force=force, revalidate=revalidate)
+            failed = False
+        finally:
+            self.concurrency.release(started, page_scraper.first_byte, page_scraper.status, page_scraper.attempts, failed=failed)
+            progress.concurrency = self.concurrency.get_limit()
+
+
+    def _finish_page(self, progress: DownloadProgress, page_scraper: PageScraper, future: cf.Future[None]) -> None:
+        progress.finish_page(page_scraper.downloaded, failed=future.exception() is not None)
+
+
+    def _iter_saved_async(
+        self,
+        selected: dict[str, str],
+        save_dir: Directory,
+        concurrency: int,
+        force: bool,
+        revalidate: bool,
+        progress: DownloadProgress
+    ) -> Iterator[str]: # break arguments into seperate lines to avoid line being to long
+        name: str
+        url: str
+        for name, url in selected.items():
+            self.scrapers[name] = self._make_scraper(url, pooled=False)
+
+        # the event loop runs in its own thread and hands over finished pages through the queue, `None` marks the end
+        done: queue.Queue[str | None] = queue.Queue()
+        loop_errors: list[BaseException] = []
+
+        def run_loop() -> None:
+            try:
+                asyncio.run(self._save_all_async(save_dir, concurrency, force, revalidate, list(selected.keys()), done, progress))
+            except BaseException as error:
+                loop_errors.append(error)
+            finally:
+                done.put(None)
+
+        loop_thread: threading.Thread = threading.Thread(target=run_loop, daemon=True)
+        loop_thread.start()
+
+        try:
+            while (finished := done.get()) is not None:
+                yield finished
+        finally:
+            loop_thread.join()
+
+        if loop_errors:
+            raise loop_errors[0]
+
+
+    async def _save_all_async(
+        self,
+        save_dir: Directory,
+        concurrency: int,
+        force: bool,
+        revalidate: bool,
+        names: list[str],
+        done: queue.Queue[str | None],
+        progress: DownloadProgress
+    ) -> None:
+        # only import when needed, so the threaded engine works without aiohttp installed
+        try:
+            import aiohttp
+        except ImportError as error:
+            raise RuntimeError("The async download engine requires `aiohttp` to be installed") from error
+
+        # with an adaptive limit there have to be enough connections for the highest it can go
+        if self.concurrency is not None:
+            concurrency = self.concurrency.maximum
+
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max(concurrency, 1))
+        connector: aiohttp.TCPConnector = aiohttp.TCPConnector(limit=max(concurrency, 1))
+        # woken up whenever a download ends, as that can free a place or change the adaptive limit
+        released: asyncio.Condition = asyncio.Condition()
+
+        async def save(name: str, page_scraper: PageScraper, session: aiohttp.ClientSession) -> None:
+            progress.start_page()
+            try:
+                await page_scraper.save_html_async(self._make_html_file(save_dir, name, page_scraper.url), session, force=force, revalidate=revalidate)
+            except Exception as error:
+                self.failures[name] = error
+
+            progress.finish_page(page_scraper.downloaded, failed=name in self.failures.keys())
+
+        async def bounded_save(name: str, page_scraper: PageScraper, session: aiohttp.ClientSession) -> None:
+            if self.concurrency is None:
+                async with semaphore:
+                    await save(name, page_scraper, session)
+                done.put(name)
+                return
+
+            # the controller is shared with threads, so it is never waited on directly, which would block the event loop
+            controller: ConcurrencyController = self.concurrency
+            async with released:
+                acquired: float | None = controller.try_acquire()
+                while acquired is None:
+                    await released.wait()
+                    acquired = controller.try_acquire()
+            started: float = acquired
+
+            try:
+                await save(name, page_scraper, session)
+            finally:
+                controller.release(started, page_scraper.first_byte, page_scraper.status, page_scraper.attempts, failed=name in self.failures.keys())
+                progress.concurrency = controller.get_limit()
+                async with released:
+                    released.notify_all()
+
+            done.put(name)
+
+        timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(sock_connect=TIMEOUT, sock_read=TIMEOUT)
+
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*[bounded_save(name, self.scrapers[name], session) for name in names])
+
+
+    def _select_pages(self, page_names: Iterable[str] | None) -> dict[str, str]:
+        if page_names is None:
+            return dict(self.pages)
+
+        names: list[str] = list(page_names)
+
+        name: str
+        for name in names:
+            if not self.is_used(name):
+                raise ValueError(f"No page matches page name '{name}'")
+
+        return {name: self.pages[name] for name in names}
+
+
+    def _forget_failures(self, page_names: Iterable[str]) -> None:
+        name: str
+        for name in page_names:
+            self.failures.pop(name, None)
+
+
+    def _make_html_file(self, save_dir: Directory, name: str, url: str) -> HTMLFile:
+        # a cache names its files after the URL, a plain directory after the page
+        if isinstance(save_dir, HTMLCache):
+            return save_dir.get_file(url)
+
+        return HTMLFile(save_dir, name)
+
+
+    def _make_scraper(self, url: str, pooled: bool=True) -> PageScraper:
+        return PageScraper(
+            url,
+            headers=self.headers,
+            session_pool=self.session_pool if pooled else None,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.rate_limiter
+        )
+
+
+    def close(self) -> None:
+        """
+        Closes the SessionPool used by the scrapers, if there is one.
+        """
+
+        if self.session_pool is not None:
+            self.session_pool.close()
+            self.session_pool = None
+
+
+    def add_pages(self, pages: dict[str, str]) -> None:
+        """
+        Adds more pages to the MultiScraper (or changes the URL of existing ones).
+        They are not downloaded until `init_scrapers` is called for them.
+
+        Parameters
+        ----------
+        pages : dict[str, str]
+            | a dictionary of custom name and URL pairs, same as at initialisation
+        """
+
+        self.pages.update(pages)
+
+
+    def remove_pages(self, page_names: Iterable[str]) -> None:
+        """
+        Stops using the given pages, forgetting their scrapers and failures.
+        Already saved HTML files are left alone.
+
+        Parameters
+        ----------
+        page_names : Iterable[str]
+            | names of the pages to remove (names not being used are ignored)
+        """
+
+        names: list[str] = list(page_names)
+
+        name: str
+        for name in names:
+            self.pages.pop(name, None)
+            self.scrapers.pop(name, None)
+        self._forget_failures(names)
+
+
+    def is_failed(self, page_name: str) -> bool:
+        """
+        Checks if the page represented by `page_name` could not be saved during the last `init_scrapers`.
+
+        Parameters
+        ----------
+        page_name : str
+            | name representing the page you wish to check
+
+        Returns
+        -------
+        bool
+            | `True` if saving the page failed and `False` otherwise
+        """
+
+        return page_name in self.failures.keys()
 
 
     def is_used(self, page_name: str) -> bool: